@@ -3,31 +3,109 @@ Autonomous Content Processing Agents
 Each agent processes specific content types independently
 """
 from typing import Dict, Any
-import json
+from utils.json_io import json_loads
+from utils.log import get_logger
 from orchestrator.autonomous_agent import AutonomousAgent
 from orchestrator.agent_protocol import AgentCapability
 from models.data_models import ProductModel
-from config import MODEL_NAME, get_openai_client
+from config import MODEL_NAME, get_openai_client, get_async_openai_client
 
+logger = get_logger(__name__)
 
-class BenefitsProcessorAgent(AutonomousAgent):
-    """Processes product benefits into detailed content"""
-    
-    def __init__(self):
+
+class ContentProcessorAgent(AutonomousAgent):
+    """
+    Base class for content processor agents
+
+    Subclasses define the prompt, system role, and result key; the base
+    class handles the LLM round-trip and JSON parsing. Each processor is
+    independent, so the orchestrator can run all of them concurrently
+    through aprocess()
+    """
+
+    __slots__ = ('client',)
+
+    SYSTEM_ROLE = "You are a skincare expert. Respond only with valid JSON."
+    RESULT_KEY = "content"
+
+    def __init__(self, agent_id: str):
         super().__init__(
-            agent_id="benefits_processor",
+            agent_id=agent_id,
             capabilities=[AgentCapability.PROCESS_CONTENT],
             dependencies=[AgentCapability.PARSE_DATA]
         )
         self.client = get_openai_client()
-    
-    def process(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Process benefits content"""
+
+    def _build_prompt(self, product: ProductModel) -> str:
+        """Build the processor-specific prompt"""
+        raise NotImplementedError
+
+    def _log_result(self, result: Dict[str, Any]):
+        """Print a short summary of the processed content"""
+        pass
+
+    def _get_product(self, shared_state: Dict[str, Any]) -> ProductModel:
+        """Extract parsed product from shared state"""
         parse_result = shared_state.get('parse_data')
-        product = parse_result.get('product')
-        
-        prompt = f"""Analyze these skincare benefits and provide detailed information:
-Benefits: {', '.join(product.benefits)}
+        return parse_result.get('product')
+
+    def _build_messages(self, product: ProductModel) -> list:
+        return [
+            {"role": "system", "content": self.SYSTEM_ROLE},
+            {"role": "user", "content": self._build_prompt(product)}
+        ]
+
+    def _handle_response(self, response) -> Dict[str, Any]:
+        """Parse LLM response and wrap it under the processor's result key"""
+        result = json_loads(response.choices[0].message.content)
+        self._log_result(result)
+        return {self.RESULT_KEY: result}
+
+    def process(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Process content synchronously"""
+        product = self._get_product(shared_state)
+
+        response = self.client.chat.completions.create(
+            model=MODEL_NAME,
+            messages=self._build_messages(product),
+            temperature=0.5
+        )
+
+        return self._handle_response(response)
+
+    async def aprocess(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process content asynchronously
+
+        All four processors share one AsyncOpenAI client (and therefore
+        one connection pool) per event loop, so the orchestrator can
+        collapse four sequential round-trips into one
+        """
+        product = self._get_product(shared_state)
+
+        client = get_async_openai_client()
+        response = await client.chat.completions.create(
+            model=MODEL_NAME,
+            messages=self._build_messages(product),
+            temperature=0.5
+        )
+
+        return self._handle_response(response)
+
+
+class BenefitsProcessorAgent(ContentProcessorAgent):
+    """Processes product benefits into detailed content"""
+
+    __slots__ = ()
+
+    RESULT_KEY = "benefits_content"
+
+    def __init__(self):
+        super().__init__(agent_id="benefits_processor")
+
+    def _build_prompt(self, product: ProductModel) -> str:
+        return f"""Analyze these skincare benefits and provide detailed information:
+Benefits: {product.benefits_text}
 Product: {product.name}
 
 Provide:
@@ -43,40 +121,25 @@ Format as JSON:
     "timeline": "...",
     "concerns_addressed": [...]
 }}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a skincare expert. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        print(f"    → Processed benefits: {result['primary_benefit']}")
-        
-        return {"benefits_content": result}
+
+    def _log_result(self, result: Dict[str, Any]):
+        logger.info("    → Processed benefits: %s", result['primary_benefit'])
 
 
-class IngredientsProcessorAgent(AutonomousAgent):
+class IngredientsProcessorAgent(ContentProcessorAgent):
     """Processes product ingredients into detailed content"""
-    
+
+    __slots__ = ()
+
+    SYSTEM_ROLE = "You are a cosmetic chemist. Respond only with valid JSON."
+    RESULT_KEY = "ingredients_content"
+
     def __init__(self):
-        super().__init__(
-            agent_id="ingredients_processor",
-            capabilities=[AgentCapability.PROCESS_CONTENT],
-            dependencies=[AgentCapability.PARSE_DATA]
-        )
-        self.client = get_openai_client()
-    
-    def process(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Process ingredients content"""
-        parse_result = shared_state.get('parse_data')
-        product = parse_result.get('product')
-        
-        prompt = f"""Analyze these skincare ingredients:
-Ingredients: {', '.join(product.ingredients)}
+        super().__init__(agent_id="ingredients_processor")
+
+    def _build_prompt(self, product: ProductModel) -> str:
+        return f"""Analyze these skincare ingredients:
+Ingredients: {product.ingredients_text}
 Product: {product.name}
 
 Provide:
@@ -91,42 +154,27 @@ Format as JSON:
     "ingredient_synergy": "...",
     "notable_combinations": [...]
 }}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a cosmetic chemist. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        print(f"    → Processed {len(result['key_actives'])} key ingredients")
-        
-        return {"ingredients_content": result}
+
+    def _log_result(self, result: Dict[str, Any]):
+        logger.info("    → Processed %d key ingredients", len(result['key_actives']))
 
 
-class UsageProcessorAgent(AutonomousAgent):
+class UsageProcessorAgent(ContentProcessorAgent):
     """Processes usage instructions into detailed content"""
-    
+
+    __slots__ = ()
+
+    SYSTEM_ROLE = "You are a skincare routine expert. Respond only with valid JSON."
+    RESULT_KEY = "usage_content"
+
     def __init__(self):
-        super().__init__(
-            agent_id="usage_processor",
-            capabilities=[AgentCapability.PROCESS_CONTENT],
-            dependencies=[AgentCapability.PARSE_DATA]
-        )
-        self.client = get_openai_client()
-    
-    def process(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Process usage content"""
-        parse_result = shared_state.get('parse_data')
-        product = parse_result.get('product')
-        
-        prompt = f"""Create detailed usage instructions for this product:
+        super().__init__(agent_id="usage_processor")
+
+    def _build_prompt(self, product: ProductModel) -> str:
+        return f"""Create detailed usage instructions for this product:
 Product: {product.name}
 Basic Instructions: {product.usage_instructions}
-Skin Types: {', '.join(product.skin_types)}
+Skin Types: {product.skin_types_text}
 
 Provide:
 1. Step-by-step application guide
@@ -143,42 +191,27 @@ Format as JSON:
     "pair_with": [...],
     "avoid_with": [...]
 }}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a skincare routine expert. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        print(f"    → Processed {len(result['steps'])} usage steps")
-        
-        return {"usage_content": result}
+
+    def _log_result(self, result: Dict[str, Any]):
+        logger.info("    → Processed %d usage steps", len(result['steps']))
 
 
-class SafetyProcessorAgent(AutonomousAgent):
+class SafetyProcessorAgent(ContentProcessorAgent):
     """Processes safety information into detailed content"""
-    
+
+    __slots__ = ()
+
+    SYSTEM_ROLE = "You are a dermatology safety expert. Respond only with valid JSON."
+    RESULT_KEY = "safety_content"
+
     def __init__(self):
-        super().__init__(
-            agent_id="safety_processor",
-            capabilities=[AgentCapability.PROCESS_CONTENT],
-            dependencies=[AgentCapability.PARSE_DATA]
-        )
-        self.client = get_openai_client()
-    
-    def process(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Process safety content"""
-        parse_result = shared_state.get('parse_data')
-        product = parse_result.get('product')
-        
-        prompt = f"""Analyze safety information for this product:
+        super().__init__(agent_id="safety_processor")
+
+    def _build_prompt(self, product: ProductModel) -> str:
+        return f"""Analyze safety information for this product:
 Product: {product.name}
 Side Effects: {product.side_effects}
-Skin Types: {', '.join(product.skin_types)}
+Skin Types: {product.skin_types_text}
 
 Provide:
 1. Common side effects and how to manage them
@@ -193,17 +226,90 @@ Format as JSON:
     "patch_test": "...",
     "warning_signs": [...]
 }}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a dermatology safety expert. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        print(f"    → Processed {len(result['side_effects'])} safety items")
-        
-        return {"safety_content": result}
+
+    def _log_result(self, result: Dict[str, Any]):
+        logger.info("    → Processed %d safety items", len(result['side_effects']))
+
+
+class CombinedContentProcessorAgent(ContentProcessorAgent):
+    """
+    Processes benefits, ingredients, usage and safety in one LLM call
+
+    All four sections derive from the same product model, so batching
+    them into a single structured request removes three full network
+    round-trips and three repeats of the product context. The response
+    is split back into the same four result keys the individual
+    processors produce, so downstream template agents are unaffected
+    """
+
+    __slots__ = ()
+
+    SYSTEM_ROLE = ("You are a skincare expert, cosmetic chemist and dermatology "
+                   "safety advisor. Respond only with valid JSON.")
+
+    SECTION_KEYS = {
+        "benefits": "benefits_content",
+        "ingredients": "ingredients_content",
+        "usage": "usage_content",
+        "safety": "safety_content"
+    }
+
+    def __init__(self):
+        super().__init__(agent_id="content_processor")
+
+    def _build_prompt(self, product: ProductModel) -> str:
+        return f"""Analyze this skincare product and produce four content sections:
+Product: {product.name}
+Concentration: {product.concentration}
+Ingredients: {product.ingredients_text}
+Benefits: {product.benefits_text}
+Basic Instructions: {product.usage_instructions}
+Side Effects: {product.side_effects}
+Skin Types: {product.skin_types_text}
+
+Provide:
+1. benefits: primary benefit, detailed explanation of each benefit (2-3 sentences each), expected timeline for results, skin concerns addressed
+2. ingredients: key active ingredients with functions, why they work together, notable combinations
+3. usage: step-by-step application guide, best time to use (AM/PM), tips, what to pair with, what to avoid
+4. safety: common side effects and how to manage them, contraindications, patch test recommendation, warning signs
+
+Format as JSON:
+{{
+    "benefits": {{
+        "primary_benefit": "...",
+        "detailed_benefits": [{{"benefit": "...", "description": "..."}}],
+        "timeline": "...",
+        "concerns_addressed": [...]
+    }},
+    "ingredients": {{
+        "key_actives": [{{"name": "...", "function": "...", "concentration": "..."}}],
+        "ingredient_synergy": "...",
+        "notable_combinations": [...]
+    }},
+    "usage": {{
+        "steps": ["step 1", "step 2", ...],
+        "timing": "...",
+        "tips": [...],
+        "pair_with": [...],
+        "avoid_with": [...]
+    }},
+    "safety": {{
+        "side_effects": [{{"effect": "...", "management": "..."}}],
+        "contraindications": [...],
+        "patch_test": "...",
+        "warning_signs": [...]
+    }}
+}}"""
+
+    def _handle_response(self, response) -> Dict[str, Any]:
+        """Split the combined response into the four per-section result keys"""
+        combined = json_loads(response.choices[0].message.content)
+
+        result = {}
+        for section, result_key in self.SECTION_KEYS.items():
+            if section not in combined:
+                raise ValueError(f"Combined content response missing section: {section}")
+            result[result_key] = combined[section]
+
+        logger.info("    → Processed %d content sections in one call", len(result))
+        return result
@@ -2,10 +2,22 @@
 Autonomous Data Parser Agent
 Parses raw product data into structured format
 """
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List
 from orchestrator.autonomous_agent import AutonomousAgent
 from orchestrator.agent_protocol import AgentCapability
 from models.data_models import ProductModel
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Splits comma-separated fields and trims surrounding whitespace in one pass
+_CSV_SPLIT_RE = re.compile(r'\s*,\s*')
+
+
+def _split_csv(value: str) -> List[str]:
+    """Split a comma-separated string into trimmed, non-empty items"""
+    return [item for item in _CSV_SPLIT_RE.split(value.strip()) if item]
 
 
 class AutonomousDataParserAgent(AutonomousAgent):
@@ -15,7 +27,13 @@ class AutonomousDataParserAgent(AutonomousAgent):
     Capabilities: PARSE_DATA
     Dependencies: None (can execute immediately)
     """
-    
+
+    __slots__ = ()
+
+    # No dependencies, but the output is a pure function of the raw
+    # input - declare it so identical re-runs hit the result memo
+    relevant_state_keys = ['raw_product_data']
+
     def __init__(self):
         super().__init__(
             agent_id="data_parser",
@@ -41,9 +59,9 @@ class AutonomousDataParserAgent(AutonomousAgent):
         # Parse product data
         product = self._parse_product(raw_data)
         
-        print(f"    → Parsed product: {product.name}")
-        print(f"    → Ingredients: {len(product.ingredients)}")
-        print(f"    → Benefits: {len(product.benefits)}")
+        logger.info("    → Parsed product: %s", product.name)
+        logger.info("    → Ingredients: %d", len(product.ingredients))
+        logger.info("    → Benefits: %d", len(product.benefits))
         
         return {"product": product}
     
@@ -54,17 +72,10 @@ class AutonomousDataParserAgent(AutonomousAgent):
         name = raw_data.get('product_name', '').strip()
         concentration = raw_data.get('concentration', '').strip()
         
-        # Parse skin types
-        skin_type_str = raw_data.get('skin_type', '')
-        skin_types = [s.strip() for s in skin_type_str.split(',') if s.strip()]
-        
-        # Parse ingredients
-        ingredients_str = raw_data.get('key_ingredients', '')
-        ingredients = [i.strip() for i in ingredients_str.split(',') if i.strip()]
-        
-        # Parse benefits
-        benefits_str = raw_data.get('benefits', '')
-        benefits = [b.strip() for b in benefits_str.split(',') if b.strip()]
+        # Parse comma-separated list fields
+        skin_types = _split_csv(raw_data.get('skin_type', ''))
+        ingredients = _split_csv(raw_data.get('key_ingredients', ''))
+        benefits = _split_csv(raw_data.get('benefits', ''))
         
         # Parse usage
         usage = raw_data.get('how_to_use', '').strip()
@@ -77,7 +88,7 @@ class AutonomousDataParserAgent(AutonomousAgent):
         price_clean = price_str.replace('₹', '').replace(',', '').strip()
         try:
             price = float(price_clean)
-        except:
+        except ValueError:
             price = 0.0
         
         # Create ProductModel
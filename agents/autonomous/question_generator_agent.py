@@ -2,11 +2,22 @@
 Autonomous Question Generator Agent
 Generates user questions from product data using LLM
 """
+import re
 from typing import Dict, Any, List
 from orchestrator.autonomous_agent import AutonomousAgent
 from orchestrator.agent_protocol import AgentCapability
 from models.data_models import ProductModel, Question
 from config import MODEL_NAME, get_openai_client
+from utils.json_io import json_loads
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Matches "[Category] Question text" lines in the LLM response
+_QUESTION_LINE_RE = re.compile(
+    r'^\s*\[(?P<category>[^\]]+)\]\s*(?P<question>\S.*?)\s*$',
+    re.MULTILINE
+)
 
 
 class AutonomousQuestionGeneratorAgent(AutonomousAgent):
@@ -16,7 +27,9 @@ class AutonomousQuestionGeneratorAgent(AutonomousAgent):
     Capabilities: GENERATE_QUESTIONS
     Dependencies: PARSE_DATA (needs product data)
     """
-    
+
+    __slots__ = ('client',)
+
     CATEGORIES = [
         "Informational",
         "Safety",
@@ -26,7 +39,20 @@ class AutonomousQuestionGeneratorAgent(AutonomousAgent):
         "Ingredients",
         "Benefits"
     ]
-    
+
+    # Built once at class definition - _calculate_priority is called per
+    # parsed question, so the dict must not be rebuilt on every call
+    PRIORITY_MAP = {
+        "Safety": 1,
+        "Usage": 2,
+        "Informational": 3,
+        "Benefits": 4,
+        "Ingredients": 5,
+        "Purchase": 6,
+        "Comparison": 7
+    }
+    DEFAULT_PRIORITY = 5
+
     def __init__(self):
         super().__init__(
             agent_id="question_generator",
@@ -58,93 +84,105 @@ class AutonomousQuestionGeneratorAgent(AutonomousAgent):
         # Generate questions
         questions = self._generate_questions(product)
         
-        print(f"    → Generated {len(questions)} questions")
-        print(f"    → Categories: {len(set(q.category for q in questions))}")
+        logger.info("    → Generated %d questions", len(questions))
+        logger.info("    → Categories: %d", len(set(q.category for q in questions)))
         
         return {"questions": questions}
     
     def _generate_questions(self, product: ProductModel) -> List[Question]:
         """Generate questions using LLM"""
         
-        prompt = f"""Generate exactly 15 user questions about this skincare product. 
+        prompt = f"""Generate exactly 15 user questions about this skincare product.
 Distribute them across these categories: {', '.join(self.CATEGORIES)}
 
 Product Details:
 - Name: {product.name}
 - Concentration: {product.concentration}
-- Skin Types: {', '.join(product.skin_types)}
-- Key Ingredients: {', '.join(product.ingredients)}
-- Benefits: {', '.join(product.benefits)}
+- Skin Types: {product.skin_types_text}
+- Key Ingredients: {product.ingredients_text}
+- Benefits: {product.benefits_text}
 - Usage: {product.usage_instructions}
 - Side Effects: {product.side_effects}
 - Price: {product.currency} {product.price}
 
-Format each question as:
-[CATEGORY] Question text here?
-
 Ensure questions are:
 1. Natural and conversational
 2. Relevant to the product
 3. Diverse across categories
 4. Actionable for users
 
-Generate exactly 15 questions now:"""
-        
+Format as JSON:
+{{
+    "questions": [
+        {{"category": "CATEGORY", "question": "Question text here?"}},
+        ...
+    ]
+}}"""
+
         response = self.client.chat.completions.create(
             model=MODEL_NAME,
             messages=[
-                {"role": "system", "content": "You are an expert at generating user questions for skincare products."},
+                {"role": "system", "content": "You are an expert at generating user questions for skincare products. Respond only with valid JSON."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7
         )
-        
+
         questions_text = response.choices[0].message.content
-        questions = self._parse_questions(questions_text)
-        
+
+        try:
+            questions = self._parse_questions_json(questions_text)
+        except (ValueError, KeyError, TypeError):
+            # Model ignored the schema - fall back to the line-based parser
+            questions = self._parse_questions(questions_text)
+
         return questions
+
+    def _parse_questions_json(self, questions_text: str) -> List[Question]:
+        """Parse the structured JSON question list"""
+        payload = json_loads(questions_text)
+
+        questions = []
+        for item in payload["questions"]:
+            category = item["category"].strip()
+            question_text = item["question"].strip()
+
+            if category not in self.CATEGORIES or not question_text:
+                continue
+
+            questions.append(Question(
+                id=f"Q{len(questions) + 1:03d}",
+                category=category,
+                question=question_text,
+                priority=self._calculate_priority(category)
+            ))
+
+        if len(questions) < 15:
+            raise ValueError(f"Only generated {len(questions)} questions, need 15+")
+
+        return questions[:15]
     
     def _parse_questions(self, questions_text: str) -> List[Question]:
-        """Parse LLM response into Question objects"""
+        """Parse LLM response into Question objects with one regex scan"""
         questions = []
-        lines = questions_text.strip().split('\n')
-        
-        question_id = 1
-        for line in lines:
-            line = line.strip()
-            if not line or not '[' in line:
-                continue
-            
-            try:
-                category_end = line.index(']')
-                category = line[1:category_end].strip()
-                question_text = line[category_end+1:].strip()
-                
-                if category in self.CATEGORIES and question_text:
-                    questions.append(Question(
-                        id=f"Q{question_id:03d}",
-                        category=category,
-                        question=question_text,
-                        priority=self._calculate_priority(category)
-                    ))
-                    question_id += 1
-            except:
+
+        for match in _QUESTION_LINE_RE.finditer(questions_text):
+            category = match.group('category').strip()
+            if category not in self.CATEGORIES:
                 continue
-        
+
+            questions.append(Question(
+                id=f"Q{len(questions) + 1:03d}",
+                category=category,
+                question=match.group('question'),
+                priority=self._calculate_priority(category)
+            ))
+
         if len(questions) < 15:
             raise ValueError(f"Only generated {len(questions)} questions, need 15+")
-        
+
         return questions[:15]
     
     def _calculate_priority(self, category: str) -> int:
         """Calculate question priority based on category"""
-        priority_map = {
-            "Safety": 1,
-            "Usage": 2,
-            "Informational": 3,
-            "Benefits": 4,
-            "Ingredients": 5,
-            "Purchase": 6,
-            "Comparison": 7
-        }
-        return priority_map.get(category, 5)
+        return self.PRIORITY_MAP.get(category, self.DEFAULT_PRIORITY)
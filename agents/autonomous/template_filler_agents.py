@@ -2,239 +2,517 @@
 Autonomous Template Filling Agents
 Each agent fills a specific template type independently
 """
+import asyncio
+import os
 from typing import Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timezone
 from orchestrator.autonomous_agent import AutonomousAgent
 from orchestrator.agent_protocol import AgentCapability
 from models.data_models import ProductModel, Question
-from templates.template_schemas import TemplateRegistry, TemplateValidator
-from config import MODEL_NAME, get_openai_client
+from templates.template_schemas import get_template_registry, get_template_validator
+from config import (
+    MODEL_NAME, MAX_CONCURRENT_REQUESTS,
+    get_openai_client, get_async_openai_client
+)
+from utils.json_io import json_loads
+from utils.log import get_logger
+from utils.streaming import astream_json_completion
+
+logger = get_logger(__name__)
+
+
+def _run_timestamp(shared_state: Dict[str, Any]) -> str:
+    """Run-level timestamp set by the orchestrator, with a local fallback"""
+    return shared_state.get('run_timestamp') or datetime.now(timezone.utc).isoformat()
 
 
 class FAQTemplateAgent(AutonomousAgent):
     """Fills FAQ template with questions and answers"""
-    
+
+    __slots__ = ('registry', 'validator', 'client', 'use_batch_api')
+
+    # Questions marshaled into each answer request - one call answers a
+    # group of questions, so 15 questions cost 3 round-trips instead of 15
+    ANSWERS_PER_CALL = 5
+
+    # Prompt templates are built once at class definition; methods only
+    # interpolate per-call fields
+    ANSWER_SYSTEM_TEMPLATE = """You are a helpful skincare expert answering questions about this product:
+
+Product: {name}
+Concentration: {concentration}
+Ingredients: {ingredients}
+Benefits: {benefits}
+Usage: {usage}
+Side Effects: {side_effects}
+Price: {currency} {price}
+Skin Types: {skin_types}"""
+
+    ANSWER_PROMPT_TEMPLATE = """Question: {question}
+
+Provide a clear, concise, and helpful answer (2-3 sentences):"""
+
+    ANSWER_CHUNK_TEMPLATE = """Questions:
+{questions}
+
+Provide a clear, concise, and helpful answer (2-3 sentences) for each question.
+Format as JSON:
+{{
+    "answers": ["answer to question 1", "answer to question 2", ...]
+}}"""
+
     def __init__(self):
         super().__init__(
             agent_id="faq_template_filler",
             capabilities=[AgentCapability.FILL_TEMPLATE],
             dependencies=[AgentCapability.PARSE_DATA, AgentCapability.GENERATE_QUESTIONS]
         )
-        self.registry = TemplateRegistry()
-        self.validator = TemplateValidator()
+        self.registry = get_template_registry()
+        self.validator = get_template_validator()
         self.client = get_openai_client()
-    
+        # Opt-in offline mode: answers go through the Batch API instead
+        # of interactive requests (cheaper, but up to 24h turnaround)
+        self.use_batch_api = os.getenv('FAQ_USE_BATCH_API', '').lower() in ('1', 'true', 'yes')
+
     def process(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
         """Fill FAQ template"""
+        product, questions = self._get_inputs(shared_state)
+
+        # Generate answers
+        answered_questions = self._generate_answers(questions, product)
+
+        return self._fill_template(shared_state, product, answered_questions)
+
+    async def aprocess(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of process - overlaps with other template agents"""
+        product, questions = self._get_inputs(shared_state)
+
+        if self.use_batch_api:
+            answered_questions = await asyncio.to_thread(
+                self._generate_answers_batch, questions, product
+            )
+        else:
+            answered_questions = await self._agenerate_answers(questions, product)
+
+        return self._fill_template(shared_state, product, answered_questions)
+
+    def _get_inputs(self, shared_state: Dict[str, Any]):
+        """Extract product and questions from shared state"""
         parse_result = shared_state.get('parse_data')
         question_result = shared_state.get('generate_questions')
-        
-        product = parse_result.get('product')
-        questions = question_result.get('questions')
-        
-        # Get template
+
+        return parse_result.get('product'), question_result.get('questions')
+
+    def _fill_template(self, shared_state: Dict[str, Any], product: ProductModel,
+                       answered_questions: List[Question]) -> Dict[str, Any]:
+        """Fill and validate the FAQ template with answered questions"""
         template = self.registry.get_template('faq')
-        
-        # Generate answers
-        answered_questions = self._generate_answers(questions, product)
-        
-        # Fill template
-        categories = list(set(q.category for q in answered_questions))
-        
+
+        # Single pass over the questions; dict.fromkeys dedupes while
+        # keeping first-seen order, so output is deterministic
+        categories = list(dict.fromkeys(q.category for q in answered_questions))
+
         template["product_name"] = product.name
         template["total_questions"] = len(answered_questions)
         template["categories"] = categories
-        template["questions"] = [q.to_dict() for q in answered_questions]
-        template["metadata"]["generated_at"] = datetime.now().isoformat()
-        
+        # Emit the dicts inline - one comprehension builds the full list
+        # without a method call per question
+        template["questions"] = [
+            {
+                "id": q.id,
+                "category": q.category,
+                "question": q.question,
+                "answer": q.answer,
+                "priority": q.priority
+            }
+            for q in answered_questions
+        ]
+        template["metadata"]["generated_at"] = _run_timestamp(shared_state)
+
         # Validate
         self.validator.validate('faq', template)
-        
-        print(f"    → Filled FAQ template with {len(answered_questions)} Q&A pairs")
-        
+
+        logger.info("    → Filled FAQ template with %d Q&A pairs", len(answered_questions))
+
         return {"faq_page": template}
     
     def _generate_answers(self, questions: List[Question], product: ProductModel) -> List[Question]:
-        """Generate answers for questions using LLM"""
-        
-        for question in questions:
-            prompt = f"""Answer this question about the product:
+        """Generate answers for all questions concurrently"""
+        if self.use_batch_api:
+            return self._generate_answers_batch(questions, product)
+        return asyncio.run(self._agenerate_answers(questions, product))
+
+    def _generate_answers_batch(self, questions: List[Question],
+                                product: ProductModel) -> List[Question]:
+        """Generate all answers via one offline Batch API job"""
+        from utils.openai_batch import batch_chat_completions
 
-Product: {product.name}
-Concentration: {product.concentration}
-Ingredients: {', '.join(product.ingredients)}
-Benefits: {', '.join(product.benefits)}
-Usage: {product.usage_instructions}
-Side Effects: {product.side_effects}
-Price: {product.currency} {product.price}
-Skin Types: {', '.join(product.skin_types)}
+        requests = [self._build_answer_messages(q, product) for q in questions]
+        answers = batch_chat_completions(
+            requests,
+            model=MODEL_NAME,
+            temperature=0.7,
+            max_tokens=150
+        )
 
-Question: {question.question}
+        for question, answer in zip(questions, answers):
+            question.answer = answer.strip()
 
-Provide a clear, concise, and helpful answer (2-3 sentences):"""
-            
-            response = self.client.chat.completions.create(
+        return questions
+
+    def _answer_system_message(self, product: ProductModel) -> str:
+        """
+        Build the shared system message for answer calls
+
+        The product context lives here rather than in each user prompt:
+        every answer request then starts with an identical prefix, which
+        OpenAI's prompt caching can reuse instead of re-processing
+        """
+        return self.ANSWER_SYSTEM_TEMPLATE.format(
+            name=product.name,
+            concentration=product.concentration,
+            ingredients=product.ingredients_text,
+            benefits=product.benefits_text,
+            usage=product.usage_instructions,
+            side_effects=product.side_effects,
+            currency=product.currency,
+            price=product.price,
+            skin_types=product.skin_types_text
+        )
+
+    def _build_answer_messages(self, question: Question, product: ProductModel) -> List[Dict[str, str]]:
+        """Build the chat messages for answering one question"""
+        prompt = self.ANSWER_PROMPT_TEMPLATE.format(question=question.question)
+
+        return [
+            {"role": "system", "content": self._answer_system_message(product)},
+            {"role": "user", "content": prompt}
+        ]
+
+    async def _agenerate_answers(self, questions: List[Question], product: ProductModel) -> List[Question]:
+        """Fire all answer requests at once and collect results in order"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        # Marshal questions into groups and answer each group in one call
+        chunks = [
+            questions[i:i + self.ANSWERS_PER_CALL]
+            for i in range(0, len(questions), self.ANSWERS_PER_CALL)
+        ]
+
+        tasks = [self._answer_chunk(chunk, product, semaphore) for chunk in chunks]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                raise result
+            for question, answer in zip(chunk, result):
+                question.answer = answer
+
+        return questions
+
+    async def _answer_chunk(self, questions: List[Question], product: ProductModel,
+                            semaphore: asyncio.Semaphore) -> List[str]:
+        """Answer a group of questions in a single LLM call"""
+        numbered = "\n".join(
+            f"{i}. {q.question}" for i, q in enumerate(questions, 1)
+        )
+        prompt = self.ANSWER_CHUNK_TEMPLATE.format(questions=numbered)
+
+        # Product context sits in the system message so all chunks share
+        # one cacheable prompt prefix
+        system = self._answer_system_message(product) + "\n\nRespond only with valid JSON."
+
+        async with semaphore:
+            client = get_async_openai_client()
+            response = await client.chat.completions.create(
                 model=MODEL_NAME,
                 messages=[
-                    {"role": "system", "content": "You are a helpful skincare expert."},
+                    {"role": "system", "content": system},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=150
+                max_tokens=150 * len(questions)
             )
-            
-            question.answer = response.choices[0].message.content.strip()
-        
-        return questions
+
+        answers = json_loads(response.choices[0].message.content)["answers"]
+        if len(answers) != len(questions):
+            raise ValueError(
+                f"Expected {len(questions)} answers, got {len(answers)}"
+            )
+
+        return [a.strip() for a in answers]
 
 
 class ProductPageTemplateAgent(AutonomousAgent):
     """Fills product page template with detailed content"""
-    
+
+    __slots__ = ('registry', 'validator', 'client')
+
+    COPY_PROMPT_TEMPLATE = """Write marketing copy for this product:
+Product: {name}
+Concentration: {concentration}
+Benefits: {benefits}
+Skin Types: {skin_types}
+
+Provide:
+1. A catchy, concise tagline (max 10 words)
+2. A compelling product description (3-4 sentences)
+
+Format as JSON:
+{{
+    "tagline": "...",
+    "description": "..."
+}}"""
+
     def __init__(self):
         super().__init__(
             agent_id="product_page_template_filler",
             capabilities=[AgentCapability.FILL_TEMPLATE],
             dependencies=[AgentCapability.PARSE_DATA, AgentCapability.PROCESS_CONTENT]
         )
-        self.registry = TemplateRegistry()
-        self.validator = TemplateValidator()
+        self.registry = get_template_registry()
+        self.validator = get_template_validator()
         self.client = get_openai_client()
     
     def process(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
         """Fill product page template"""
         parse_result = shared_state.get('parse_data')
         product = parse_result.get('product')
-        
-        # Get processed content from content processors
+
+        # Generate tagline and description in one call
+        tagline, description = asyncio.run(self._agenerate_copy(product))
+
+        return self._fill_template(shared_state, product, tagline, description)
+
+    async def aprocess(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of process - overlaps with other template agents"""
+        parse_result = shared_state.get('parse_data')
+        product = parse_result.get('product')
+
+        tagline, description = await self._agenerate_copy(product)
+
+        return self._fill_template(shared_state, product, tagline, description)
+
+    # Default skeletons for processed content - one dict merge per section
+    # replaces a chain of per-field .get(..., default) lookups
+    BENEFITS_DEFAULT = {
+        "primary_benefit": "",
+        "detailed_benefits": [],
+        "timeline": "",
+        "concerns_addressed": []
+    }
+    INGREDIENTS_DEFAULT = {
+        "key_actives": [],
+        "ingredient_synergy": ""
+    }
+    USAGE_DEFAULT = {
+        "steps": [],
+        "timing": "",
+        "tips": [],
+        "pair_with": [],
+        "avoid_with": []
+    }
+    SAFETY_DEFAULT = {
+        "side_effects": [],
+        "contraindications": [],
+        "patch_test": "",
+        "warning_signs": []
+    }
+
+    def _fill_template(self, shared_state: Dict[str, Any], product: ProductModel,
+                       tagline: str, description: str) -> Dict[str, Any]:
+        """Fill and validate the product page template"""
+        # Get processed content from content processors - one merge per
+        # section fills in any fields the processor left out
         process_result = shared_state.get('process_content', {})
-        benefits_content = process_result.get('benefits_content', {})
-        ingredients_content = process_result.get('ingredients_content', {})
-        usage_content = process_result.get('usage_content', {})
-        safety_content = process_result.get('safety_content', {})
-        
+        benefits_content = {**self.BENEFITS_DEFAULT, **process_result.get('benefits_content', {})}
+        ingredients_content = {**self.INGREDIENTS_DEFAULT, **process_result.get('ingredients_content', {})}
+        usage_content = {**self.USAGE_DEFAULT, **process_result.get('usage_content', {})}
+        safety_content = {**self.SAFETY_DEFAULT, **process_result.get('safety_content', {})}
+
         # Get template
         template = self.registry.get_template('product')
-        
-        # Generate tagline and description
-        tagline = self._generate_tagline(product)
-        description = self._generate_description(product)
-        
-        # Fill template
-        template["product"]["name"] = product.name
-        template["product"]["tagline"] = tagline
-        template["product"]["description"] = description
-        template["product"]["concentration"] = product.concentration
-        template["product"]["skin_types"] = product.skin_types
-        
+
+        # Fill template - batched writes per nested dict
+        template["product"].update({
+            "name": product.name,
+            "tagline": tagline,
+            "description": description,
+            "concentration": product.concentration,
+            "skin_types": product.skin_types,
+            "key_features": product.benefits
+        })
+
         # Price
-        template["product"]["price"]["amount"] = product.price
-        template["product"]["price"]["currency"] = product.currency
-        template["product"]["price"]["display"] = f"{product.currency} {product.price}"
-        
-        # Key features
-        template["product"]["key_features"] = product.benefits
-        
+        template["product"]["price"].update({
+            "amount": product.price,
+            "currency": product.currency,
+            "display": f"{product.currency} {product.price}"
+        })
+
         # Ingredients
-        template["product"]["ingredients"]["key_actives"] = ingredients_content.get("key_actives", [])
-        template["product"]["ingredients"]["synergy"] = ingredients_content.get("ingredient_synergy", "")
-        template["product"]["ingredients"]["full_list"] = product.ingredients
-        
+        template["product"]["ingredients"].update({
+            "key_actives": ingredients_content["key_actives"],
+            "synergy": ingredients_content["ingredient_synergy"],
+            "full_list": product.ingredients
+        })
+
         # Benefits
-        template["product"]["benefits"]["primary"] = benefits_content.get("primary_benefit", "")
-        template["product"]["benefits"]["detailed"] = benefits_content.get("detailed_benefits", [])
-        template["product"]["benefits"]["timeline"] = benefits_content.get("timeline", "")
-        template["product"]["benefits"]["concerns_addressed"] = benefits_content.get("concerns_addressed", [])
-        
+        template["product"]["benefits"].update({
+            "primary": benefits_content["primary_benefit"],
+            "detailed": benefits_content["detailed_benefits"],
+            "timeline": benefits_content["timeline"],
+            "concerns_addressed": benefits_content["concerns_addressed"]
+        })
+
         # Usage
-        template["product"]["usage"]["steps"] = usage_content.get("steps", [])
-        template["product"]["usage"]["timing"] = usage_content.get("timing", "")
-        template["product"]["usage"]["tips"] = usage_content.get("tips", [])
-        template["product"]["usage"]["pair_with"] = usage_content.get("pair_with", [])
-        template["product"]["usage"]["avoid_with"] = usage_content.get("avoid_with", [])
-        
+        template["product"]["usage"].update(usage_content)
+
         # Safety
-        template["product"]["safety"]["side_effects"] = safety_content.get("side_effects", [])
-        template["product"]["safety"]["contraindications"] = safety_content.get("contraindications", [])
-        template["product"]["safety"]["patch_test"] = safety_content.get("patch_test", "")
-        template["product"]["safety"]["warning_signs"] = safety_content.get("warning_signs", [])
-        
-        template["metadata"]["generated_at"] = datetime.now().isoformat()
+        template["product"]["safety"].update(safety_content)
+
+        template["metadata"]["generated_at"] = _run_timestamp(shared_state)
         
         # Validate
         self.validator.validate('product', template)
         
-        print(f"    → Filled product page template for {product.name}")
+        logger.info("    → Filled product page template for %s", product.name)
         
         return {"product_page": template}
     
-    def _generate_tagline(self, product: ProductModel) -> str:
-        """Generate product tagline"""
-        prompt = f"""Create a catchy, concise tagline (max 10 words) for this product:
-Product: {product.name}
-Benefits: {', '.join(product.benefits)}
+    async def _agenerate_copy(self, product: ProductModel) -> tuple:
+        """
+        Generate tagline and description in a single structured call
 
-Tagline:"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a marketing copywriter."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.8,
-            max_tokens=30
+        Both pieces of copy derive from the same product fields, so one
+        request with a two-field JSON schema replaces two round-trips
+        """
+        prompt = self.COPY_PROMPT_TEMPLATE.format(
+            name=product.name,
+            concentration=product.concentration,
+            benefits=product.benefits_text,
+            skin_types=product.skin_types_text
         )
-        
-        return response.choices[0].message.content.strip()
-    
-    def _generate_description(self, product: ProductModel) -> str:
-        """Generate product description"""
-        prompt = f"""Write a compelling product description (3-4 sentences) for:
-Product: {product.name}
-Concentration: {product.concentration}
-Benefits: {', '.join(product.benefits)}
-Skin Types: {', '.join(product.skin_types)}
-
-Description:"""
-        
-        response = self.client.chat.completions.create(
+
+        client = get_async_openai_client()
+        response = await client.chat.completions.create(
             model=MODEL_NAME,
             messages=[
-                {"role": "system", "content": "You are a product description writer."},
+                {"role": "system", "content": "You are a marketing copywriter. Respond only with valid JSON."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=150
+            temperature=0.8,
+            max_tokens=200
         )
-        
-        return response.choices[0].message.content.strip()
+
+        copy = json_loads(response.choices[0].message.content)
+        return copy["tagline"].strip(), copy["description"].strip()
 
 
 class ComparisonTemplateAgent(AutonomousAgent):
     """Fills comparison template with product comparison"""
-    
+
+    __slots__ = ('registry', 'validator', 'client')
+
+    PRODUCT_B_PROMPT_TEMPLATE = """Create a fictional competing product to compare with:
+Product A: {name}
+- Concentration: {concentration}
+- Price: {currency} {price}
+
+Create Product B with:
+- Similar category but different formulation
+- Different concentration
+- Different price point
+- Different ingredient mix
+- Realistic product name
+
+Format as JSON:
+{{
+    "name": "...",
+    "concentration": "...",
+    "ingredients": [...],
+    "benefits": [...],
+    "price": number,
+    "currency": "INR",
+    "skin_types": [...]
+}}"""
+
+    COMPARISON_PROMPT_TEMPLATE = """Compare these two skincare products:
+
+Product A: {name}
+- Concentration: {concentration}
+- Ingredients: {ingredients}
+- Benefits: {benefits}
+- Price: {currency} {price}
+- Skin Types: {skin_types}
+
+Product B: {b_name}
+- Concentration: {b_concentration}
+- Ingredients: {b_ingredients}
+- Benefits: {b_benefits}
+- Price: {b_currency} {b_price}
+- Skin Types: {b_skin_types}
+
+Provide:
+1. Key differences
+2. Similarities
+3. Which is better for specific concerns
+4. Price-value comparison
+5. Recommendation
+
+Format as JSON:
+{{
+    "product_a": {{"name": "...", "strengths": [...], "weaknesses": [...]}},
+    "product_b": {{"name": "...", "strengths": [...], "weaknesses": [...]}},
+    "key_differences": [...],
+    "similarities": [...],
+    "best_for": {{"product_a": [...], "product_b": [...]}},
+    "price_value": "...",
+    "recommendation": "..."
+}}"""
+
     def __init__(self):
         super().__init__(
             agent_id="comparison_template_filler",
             capabilities=[AgentCapability.FILL_TEMPLATE],
             dependencies=[AgentCapability.PARSE_DATA]
         )
-        self.registry = TemplateRegistry()
-        self.validator = TemplateValidator()
+        self.registry = get_template_registry()
+        self.validator = get_template_validator()
         self.client = get_openai_client()
     
     def process(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
         """Fill comparison template"""
         parse_result = shared_state.get('parse_data')
         product = parse_result.get('product')
-        
+
         # Generate comparison data
-        comparison_data = self._generate_comparison(product)
-        
+        comparison_data = asyncio.run(self._agenerate_comparison(product))
+
+        return self._fill_template(shared_state, product, comparison_data)
+
+    async def aprocess(self, shared_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of process
+
+        The two comparison calls depend on each other (Product B must
+        exist before it can be compared), so they stay sequential - but
+        running them on the event loop lets the whole agent overlap with
+        the other template fillers in the orchestrator's batch
+        """
+        parse_result = shared_state.get('parse_data')
+        product = parse_result.get('product')
+
+        comparison_data = await self._agenerate_comparison(product)
+
+        return self._fill_template(shared_state, product, comparison_data)
+
+    def _fill_template(self, shared_state: Dict[str, Any], product: ProductModel,
+                       comparison_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill and validate the comparison template"""
         # Get template
         template = self.registry.get_template('comparison')
-        
+
         # Fill template
         product_b_data = comparison_data.get('product_b_data', {})
         
@@ -265,44 +543,30 @@ class ComparisonTemplateAgent(AutonomousAgent):
         template["comparison_matrix"]["price_value"] = comparison_data.get("price_value", "")
         
         template["recommendation"] = comparison_data.get("recommendation", "")
-        template["metadata"]["generated_at"] = datetime.now().isoformat()
+        template["metadata"]["generated_at"] = _run_timestamp(shared_state)
         
         # Validate
         self.validator.validate('comparison', template)
         
-        print(f"    → Filled comparison template: {product.name} vs {product_b_data.get('name', 'Unknown')}")
+        logger.info("    → Filled comparison template: %s vs %s", product.name, product_b_data.get('name', 'Unknown'))
         
         return {"comparison_page": template}
     
-    def _generate_comparison(self, product: ProductModel) -> Dict[str, Any]:
+    async def _agenerate_comparison(self, product: ProductModel) -> Dict[str, Any]:
         """Generate comparison with fictional Product B"""
-        import json
-        
-        # First generate Product B
-        prompt_b = f"""Create a fictional competing product to compare with:
-Product A: {product.name}
-- Concentration: {product.concentration}
-- Price: {product.currency} {product.price}
-
-Create Product B with:
-- Similar category but different formulation
-- Different concentration
-- Different price point
-- Different ingredient mix
-- Realistic product name
+        client = get_async_openai_client()
 
-Format as JSON:
-{{
-    "name": "...",
-    "concentration": "...",
-    "ingredients": [...],
-    "benefits": [...],
-    "price": number,
-    "currency": "INR",
-    "skin_types": [...]
-}}"""
+        # First generate Product B
+        prompt_b = self.PRODUCT_B_PROMPT_TEMPLATE.format(
+            name=product.name,
+            concentration=product.concentration,
+            currency=product.currency,
+            price=product.price
+        )
         
-        response_b = self.client.chat.completions.create(
+        # Stream the large JSON bodies so accumulation overlaps generation
+        product_b = await astream_json_completion(
+            client,
             model=MODEL_NAME,
             messages=[
                 {"role": "system", "content": "You are a product developer. Respond only with valid JSON."},
@@ -311,44 +575,26 @@ Format as JSON:
             temperature=0.7
         )
         
-        product_b = json.loads(response_b.choices[0].message.content)
-        
         # Now generate comparison
-        prompt_comp = f"""Compare these two skincare products:
-
-Product A: {product.name}
-- Concentration: {product.concentration}
-- Ingredients: {', '.join(product.ingredients)}
-- Benefits: {', '.join(product.benefits)}
-- Price: {product.currency} {product.price}
-- Skin Types: {', '.join(product.skin_types)}
-
-Product B: {product_b['name']}
-- Concentration: {product_b['concentration']}
-- Ingredients: {', '.join(product_b['ingredients'])}
-- Benefits: {', '.join(product_b['benefits'])}
-- Price: {product_b['currency']} {product_b['price']}
-- Skin Types: {', '.join(product_b['skin_types'])}
-
-Provide:
-1. Key differences
-2. Similarities
-3. Which is better for specific concerns
-4. Price-value comparison
-5. Recommendation
-
-Format as JSON:
-{{
-    "product_a": {{"name": "...", "strengths": [...], "weaknesses": [...]}},
-    "product_b": {{"name": "...", "strengths": [...], "weaknesses": [...]}},
-    "key_differences": [...],
-    "similarities": [...],
-    "best_for": {{"product_a": [...], "product_b": [...]}},
-    "price_value": "...",
-    "recommendation": "..."
-}}"""
+        prompt_comp = self.COMPARISON_PROMPT_TEMPLATE.format(
+            name=product.name,
+            concentration=product.concentration,
+            ingredients=product.ingredients_text,
+            benefits=product.benefits_text,
+            currency=product.currency,
+            price=product.price,
+            skin_types=product.skin_types_text,
+            b_name=product_b['name'],
+            b_concentration=product_b['concentration'],
+            b_ingredients=', '.join(product_b['ingredients']),
+            b_benefits=', '.join(product_b['benefits']),
+            b_currency=product_b['currency'],
+            b_price=product_b['price'],
+            b_skin_types=', '.join(product_b['skin_types'])
+        )
         
-        response_comp = self.client.chat.completions.create(
+        comparison = await astream_json_completion(
+            client,
             model=MODEL_NAME,
             messages=[
                 {"role": "system", "content": "You are a product comparison expert. Respond only with valid JSON."},
@@ -356,8 +602,6 @@ Format as JSON:
             ],
             temperature=0.5
         )
-        
-        comparison = json.loads(response_comp.choices[0].message.content)
         comparison['product_b_data'] = product_b
         
         return comparison
@@ -4,6 +4,7 @@ All agents inherit from this base class
 """
 from abc import ABC, abstractmethod
 from typing import Any, Dict
+import asyncio
 import time
 from models.data_models import AgentResult
 
@@ -31,14 +32,27 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def execute_async(self, context: Dict[str, Any]) -> AgentResult:
+        """
+        Async entry point for orchestrator fan-out
+        
+        Default runs the synchronous execute on a worker thread, so
+        independent agents (e.g. content logic and question generation,
+        which both need only the parsed product) can run concurrently
+        under asyncio.gather without each agent having to go async
+        """
+        return await asyncio.to_thread(self.execute, context)
+    
     def _wrap_execution(self, func, *args, **kwargs) -> AgentResult:
         """
         Wrapper for execution with timing and error handling
         """
-        start_time = time.time()
+        # Monotonic clock - wall-clock (time.time) can jump under NTP
+        # and is too coarse for sub-ms timings under concurrent fan-out
+        start_time = time.perf_counter()
         try:
             result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             self.execution_count += 1
             
             return AgentResult(
@@ -48,7 +62,7 @@ class BaseAgent(ABC):
                 execution_time=execution_time
             )
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             return AgentResult(
                 agent_name=self.agent_name,
                 success=False,
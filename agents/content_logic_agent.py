@@ -2,10 +2,15 @@
 ContentLogic Agent
 Responsibility: Apply reusable content transformation blocks
 """
-from typing import Dict, Any
+import asyncio
+import time
+from typing import Any, Dict, List
 from agents.base_agent import BaseAgent
 from models.data_models import AgentResult, ProductModel
-from content_blocks.content_blocks import CONTENT_BLOCKS
+from content_blocks.content_blocks import CONTENT_BLOCKS, gather_blocks
+from utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 class ContentLogicAgent(BaseAgent):
@@ -30,28 +35,81 @@ class ContentLogicAgent(BaseAgent):
         """
         return self._wrap_execution(self._apply_blocks, context)
     
+    def execute_batch(self, contexts: List[Dict[str, Any]]) -> List[AgentResult]:
+        """
+        Apply content blocks for several contexts in one invocation
+
+        Sync wrapper around execute_batch_async for callers outside an
+        event loop
+        """
+        return asyncio.run(self.execute_batch_async(contexts))
+
+    async def execute_batch_async(self, contexts: List[Dict[str, Any]]) -> List[AgentResult]:
+        """
+        Async batched execution - all contexts' blocks share one fan-out
+
+        Each context gets its own AgentResult (success or failure), so
+        callers handle errors exactly as with per-context execute calls,
+        but the agent is entered once and identical block requests
+        across contexts collapse in the shared response cache
+
+        Returns:
+            AgentResults in the same order as contexts
+        """
+        async def run_one(context: Dict[str, Any]) -> AgentResult:
+            start_time = time.perf_counter()
+            try:
+                data = await self._apply_blocks_async(context)
+                self.execution_count += 1
+                return AgentResult(
+                    agent_name=self.agent_name,
+                    success=True,
+                    data=data,
+                    execution_time=time.perf_counter() - start_time
+                )
+            except Exception as e:
+                return AgentResult(
+                    agent_name=self.agent_name,
+                    success=False,
+                    data=None,
+                    error=str(e),
+                    execution_time=time.perf_counter() - start_time
+                )
+
+        return list(await asyncio.gather(*(run_one(c) for c in contexts)))
+
     def _apply_blocks(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Apply specified content blocks"""
+        return asyncio.run(self._apply_blocks_async(context))
+
+    async def _apply_blocks_async(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a context and fan its blocks out on the async client"""
         product = context.get('product')
         block_types = context.get('block_types', [])
-        
+
         if not isinstance(product, ProductModel):
             raise ValueError("Product must be ProductModel instance")
-        
+
         if not block_types:
             raise ValueError("No block_types specified")
-        
-        results = {}
+
         for block_type in block_types:
             if block_type not in self.blocks:
                 raise ValueError(f"Unknown block type: {block_type}")
-            
-            block = self.blocks[block_type]
-            
-            # Pass only additional kwargs, not the entire context
-            kwargs = {k: v for k, v in context.items() if k not in ['product', 'block_types']}
-            results[block_type] = block.process(product, **kwargs)
-            print(f"  ✓ Applied {block_type} block")
-        
-        print(f"✓ {self.agent_name}: Applied {len(results)} content blocks")
+
+        # Pass only additional kwargs, not the entire context
+        kwargs = {k: v for k, v in context.items() if k not in ['product', 'block_types']}
+
+        # Each block is an independent LLM call - gather them on the
+        # async client and zip results back into block_types order
+        block_results = await gather_blocks(
+            [self.blocks[block_type] for block_type in block_types],
+            product, **kwargs
+        )
+        results = dict(zip(block_types, block_results))
+
+        for block_type in block_types:
+            logger.info("  ✓ Applied %s block", block_type)
+
+        logger.info("✓ %s: Applied %d content blocks", self.agent_name, len(results))
         return results
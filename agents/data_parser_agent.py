@@ -5,6 +5,9 @@ Responsibility: Parse and validate raw product data
 from typing import Dict, Any
 from agents.base_agent import BaseAgent
 from models.data_models import AgentResult, ProductModel
+from utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 class DataParserAgent(BaseAgent):
@@ -42,5 +45,5 @@ class DataParserAgent(BaseAgent):
         if not product.validate():
             raise ValueError("Product validation failed")
         
-        print(f"✓ {self.agent_name}: Parsed product '{product.name}'")
+        logger.info("✓ %s: Parsed product '%s'", self.agent_name, product.name)
         return product
@@ -2,10 +2,22 @@
 QuestionGenerator Agent
 Responsibility: Generate categorized user questions from product data
 """
+import re
+from functools import cached_property
 from typing import Dict, Any, List
 from agents.base_agent import BaseAgent
 from models.data_models import AgentResult, ProductModel, Question
 from config import MODEL_NAME, get_openai_client
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Matches "[Category] Question text" lines in the LLM response - one
+# C-level scan over the whole text instead of per-line Python slicing
+_QUESTION_LINE_RE = re.compile(
+    r'^\s*\[(?P<category>[^\]]+)\]\s*(?P<question>\S.*?)\s*$',
+    re.MULTILINE
+)
 
 
 class QuestionGeneratorAgent(BaseAgent):
@@ -23,10 +35,29 @@ class QuestionGeneratorAgent(BaseAgent):
         "Ingredients",
         "Benefits"
     ]
+    # Frozen set for O(1) membership checks in the parse loop
+    CATEGORIES_SET = frozenset(CATEGORIES)
+
+    # Built once at class definition - _calculate_priority runs per parsed
+    # question, so the dict must not be rebuilt on every call
+    PRIORITY_MAP = {
+        "Safety": 1,
+        "Usage": 2,
+        "Informational": 3,
+        "Benefits": 4,
+        "Ingredients": 5,
+        "Purchase": 6,
+        "Comparison": 7
+    }
+    DEFAULT_PRIORITY = 5
     
     def __init__(self):
         super().__init__("QuestionGeneratorAgent")
-        self.client = get_openai_client()
+    
+    @cached_property
+    def client(self):
+        """LLM client, constructed on first use so LLM-free runs stay cheap"""
+        return get_openai_client()
     
     def execute(self, context: Dict[str, Any]) -> AgentResult:
         """
@@ -62,7 +93,7 @@ class QuestionGeneratorAgent(BaseAgent):
         questions_text = response.choices[0].message.content
         questions = self._parse_questions(questions_text)
         
-        print(f"✓ {self.agent_name}: Generated {len(questions)} questions")
+        logger.info("✓ %s: Generated %d questions", self.agent_name, len(questions))
         return questions
     
     def _build_prompt(self, product: ProductModel) -> str:
@@ -73,9 +104,9 @@ Distribute them across these categories: {', '.join(self.CATEGORIES)}
 Product Details:
 - Name: {product.name}
 - Concentration: {product.concentration}
-- Skin Types: {', '.join(product.skin_types)}
-- Key Ingredients: {', '.join(product.ingredients)}
-- Benefits: {', '.join(product.benefits)}
+- Skin Types: {product.skin_types_text}
+- Key Ingredients: {product.ingredients_text}
+- Benefits: {product.benefits_text}
 - Usage: {product.usage_instructions}
 - Side Effects: {product.side_effects}
 - Price: {product.currency} {product.price}
@@ -92,32 +123,20 @@ Ensure questions are:
 Generate exactly 15 questions now:"""
     
     def _parse_questions(self, questions_text: str) -> List[Question]:
-        """Parse LLM response into Question objects"""
+        """Parse LLM response into Question objects with one regex scan"""
         questions = []
-        lines = questions_text.strip().split('\n')
         
-        question_id = 1
-        for line in lines:
-            line = line.strip()
-            if not line or not '[' in line:
+        for match in _QUESTION_LINE_RE.finditer(questions_text):
+            category = match.group('category').strip()
+            if category not in self.CATEGORIES_SET:
                 continue
             
-            # Extract category and question
-            try:
-                category_end = line.index(']')
-                category = line[1:category_end].strip()
-                question_text = line[category_end+1:].strip()
-                
-                if category in self.CATEGORIES and question_text:
-                    questions.append(Question(
-                        id=f"Q{question_id:03d}",
-                        category=category,
-                        question=question_text,
-                        priority=self._calculate_priority(category)
-                    ))
-                    question_id += 1
-            except:
-                continue
+            questions.append(Question(
+                id=f"Q{len(questions) + 1:03d}",
+                category=category,
+                question=match.group('question'),
+                priority=self._calculate_priority(category)
+            ))
         
         # Ensure we have at least 15 questions
         if len(questions) < 15:
@@ -127,13 +146,4 @@ Generate exactly 15 questions now:"""
     
     def _calculate_priority(self, category: str) -> int:
         """Calculate question priority based on category"""
-        priority_map = {
-            "Safety": 1,
-            "Usage": 2,
-            "Informational": 3,
-            "Benefits": 4,
-            "Ingredients": 5,
-            "Purchase": 6,
-            "Comparison": 7
-        }
-        return priority_map.get(category, 5)
+        return self.PRIORITY_MAP.get(category, self.DEFAULT_PRIORITY)
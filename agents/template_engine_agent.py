@@ -2,12 +2,24 @@
 TemplateEngine Agent
 Responsibility: Fill templates with processed content
 """
+import asyncio
+import copy
+import hashlib
+from functools import cached_property
 from typing import Dict, Any, List
 from datetime import datetime
 from agents.base_agent import BaseAgent
 from models.data_models import AgentResult, ProductModel, Question
-from templates.template_schemas import TemplateRegistry, TemplateValidator
-from config import MODEL_NAME, get_openai_client
+from templates.template_schemas import get_template_registry, get_template_validator
+from config import (
+    ANSWER_MODEL, TAGLINE_MODEL,
+    get_openai_client, get_async_openai_client
+)
+from utils.json_io import json_loads
+from utils.streaming import astream_completion
+from utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 class TemplateEngineAgent(BaseAgent):
@@ -18,9 +30,26 @@ class TemplateEngineAgent(BaseAgent):
     
     def __init__(self):
         super().__init__("TemplateEngineAgent")
-        self.registry = TemplateRegistry()
-        self.validator = TemplateValidator()
-        self.client = get_openai_client()
+        self.registry = get_template_registry()
+        self.validator = get_template_validator()
+        # Prototype of each schema, built once - fills deep-copy instead
+        # of reconstructing the nested dict per invocation
+        self._template_proto = {
+            t: self.registry.get_template(t)
+            for t in ("faq", "product", "comparison")
+        }
+        # Memo of prompt-hash -> answer: identical sub-prompts (retries,
+        # repeated fills of the same product) skip the network entirely
+        self._answer_cache: Dict[str, str] = {}
+        # Shape fingerprints of templates that already validated - bulk
+        # runs produce identically-shaped templates, so re-walking the
+        # schema per product is wasted work
+        self._validated_shapes: set = set()
+    
+    @cached_property
+    def client(self):
+        """LLM client, constructed on first use so LLM-free runs stay cheap"""
+        return get_openai_client()
     
     def execute(self, context: Dict[str, Any]) -> AgentResult:
         """
@@ -41,8 +70,11 @@ class TemplateEngineAgent(BaseAgent):
         if not template_type:
             raise ValueError("No template_type specified")
         
-        # Get empty template
-        template = self.registry.get_template(template_type)
+        if template_type not in self._template_proto:
+            raise ValueError(f"Unknown template type: {template_type}")
+        
+        # Get empty template - fresh mutable copy of the cached prototype
+        template = copy.deepcopy(self._template_proto[template_type])
         
         # Fill based on type
         if template_type == "faq":
@@ -54,12 +86,41 @@ class TemplateEngineAgent(BaseAgent):
         else:
             raise ValueError(f"Unknown template type: {template_type}")
         
-        # Validate
-        self.validator.validate(template_type, filled)
+        # Validate - skipped when an identically-shaped template already
+        # passed (validation only inspects structure, not leaf values)
+        fingerprint = f"{template_type}:{self._shape_fingerprint(filled)}"
+        if fingerprint not in self._validated_shapes:
+            self.validator.validate(template_type, filled)
+            self._validated_shapes.add(fingerprint)
         
-        print(f"✓ {self.agent_name}: Filled {template_type} template")
+        logger.info("✓ %s: Filled %s template", self.agent_name, template_type)
         return filled
     
+    @classmethod
+    def _shape_fingerprint(cls, obj: Any) -> str:
+        """Hash a template's structure, ignoring leaf values
+
+        None leaves keep their own shape: validation treats a None field
+        as missing, so a template with unfilled fields must not share a
+        fingerprint with a fully-filled one
+        """
+        return hashlib.blake2b(cls._shape(obj).encode()).hexdigest()
+    
+    @classmethod
+    def _shape(cls, obj: Any) -> str:
+        """Recursive structural description of nested dicts/lists"""
+        if isinstance(obj, dict):
+            items = ",".join(f"{k}:{cls._shape(v)}" for k, v in sorted(obj.items()))
+            return f"{{{items}}}"
+        if isinstance(obj, list):
+            return f"[{','.join(cls._shape(v) for v in obj)}]"
+        return type(obj).__name__
+    
+    @staticmethod
+    def _generated_at(context: Dict[str, Any]) -> str:
+        """Run-level timestamp from the orchestrator, with a local fallback"""
+        return context.get('generated_at') or datetime.now().isoformat()
+    
     def _fill_faq_template(self, template: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Fill FAQ template"""
         product = context.get('product')
@@ -81,43 +142,83 @@ class TemplateEngineAgent(BaseAgent):
         template["total_questions"] = len(answered_questions)
         template["categories"] = categories
         template["questions"] = [q.to_dict() for q in answered_questions]
-        template["metadata"]["generated_at"] = datetime.now().isoformat()
+        template["metadata"]["generated_at"] = self._generated_at(context)
         
         return template
     
     def _generate_answers(self, questions: List[Question], product: ProductModel) -> List[Question]:
         """Generate answers for questions using LLM"""
-        
-        for question in questions:
-            prompt = f"""Answer this question about the product:
+        # Answer calls are independent I/O - run them concurrently so the
+        # FAQ build costs one round-trip instead of one per question
+        return asyncio.run(self._agenerate_answers(questions, product))
 
-Product: {product.name}
+    def _product_context(self, product: ProductModel) -> str:
+        """Build the shared product-context block once per template fill"""
+        return f"""Product: {product.name}
 Concentration: {product.concentration}
-Ingredients: {', '.join(product.ingredients)}
-Benefits: {', '.join(product.benefits)}
+Ingredients: {product.ingredients_text}
+Benefits: {product.benefits_text}
 Usage: {product.usage_instructions}
 Side Effects: {product.side_effects}
 Price: {product.currency} {product.price}
-Skin Types: {', '.join(product.skin_types)}
+Skin Types: {product.skin_types_text}"""
 
-Question: {question.question}
+    async def _agenerate_answers(self, questions: List[Question],
+                                 product: ProductModel) -> List[Question]:
+        """Answer every question in one completion instead of one each
 
-Provide a clear, concise, and helpful answer (2-3 sentences):"""
-            
-            response = self.client.chat.completions.create(
-                model=MODEL_NAME,
+        A single multi-question call amortizes the network round-trip,
+        TLS setup and product-context prefill across all questions
+        """
+        client = get_async_openai_client()
+
+        question_lines = "\n".join(
+            f"{i + 1}. [{q.id}] {q.question}" for i, q in enumerate(questions)
+        )
+        # Product context lives in the system message: the prefix is then
+        # byte-identical across calls for the same product, so provider
+        # prompt caching reuses the prefill instead of recomputing it
+        system_message = f"""You are a helpful skincare expert. Respond only with valid JSON.
+
+PRODUCT CONTEXT:
+{self._product_context(product)}"""
+        prompt = f"""Answer each question about the product in 2-3 sentences.
+
+Questions:
+{question_lines}
+
+Return JSON:
+{{"answers": [{{"id": "QUESTION_ID", "answer": "answer text"}}, ...]}}"""
+
+        cache_key = hashlib.blake2b(f"{system_message}\x00{prompt}".encode()).hexdigest()
+        content = self._answer_cache.get(cache_key)
+
+        if content is None:
+            content = await astream_completion(
+                client,
+                model=ANSWER_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are a helpful skincare expert."},
+                    {"role": "system", "content": system_message},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=150
+                max_tokens=150 * len(questions),
+                response_format={"type": "json_object"}
             )
-            
-            question.answer = response.choices[0].message.content.strip()
-        
+            self._answer_cache[cache_key] = content
+
+        answers = {
+            item["id"]: item["answer"].strip()
+            for item in json_loads(content)["answers"]
+        }
+
+        for question in questions:
+            if question.id not in answers:
+                raise ValueError(f"No answer returned for question {question.id}")
+            question.answer = answers[question.id]
+
         return questions
-    
+
     def _fill_product_template(self, template: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Fill product page template"""
         product = context.get('product')
@@ -126,9 +227,9 @@ Provide a clear, concise, and helpful answer (2-3 sentences):"""
         if not isinstance(product, ProductModel):
             raise ValueError("Product must be ProductModel")
         
-        # Generate tagline and description
-        tagline = self._generate_tagline(product)
-        description = self._generate_description(product)
+        # Generate tagline and description - independent calls, so run
+        # them concurrently and pay only the slower round-trip
+        tagline, description = asyncio.run(self._agenerate_copy(product))
         
         # Fill template
         template["product"]["name"] = product.name
@@ -177,20 +278,30 @@ Provide a clear, concise, and helpful answer (2-3 sentences):"""
             template["product"]["safety"]["patch_test"] = safety_data.get("patch_test", "")
             template["product"]["safety"]["warning_signs"] = safety_data.get("warning_signs", [])
         
-        template["metadata"]["generated_at"] = datetime.now().isoformat()
+        template["metadata"]["generated_at"] = self._generated_at(context)
         
         return template
     
-    def _generate_tagline(self, product: ProductModel) -> str:
+    async def _agenerate_copy(self, product: ProductModel):
+        """Run the tagline and description calls concurrently"""
+        return await asyncio.gather(
+            self._agenerate_tagline(product),
+            self._agenerate_description(product)
+        )
+
+    async def _agenerate_tagline(self, product: ProductModel) -> str:
         """Generate product tagline"""
         prompt = f"""Create a catchy, concise tagline (max 10 words) for this product:
 Product: {product.name}
-Benefits: {', '.join(product.benefits)}
+Benefits: {product.benefits_text}
 
 Tagline:"""
         
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
+        # Streaming starts consuming at the first token instead of
+        # waiting for the full body
+        text = await astream_completion(
+            get_async_openai_client(),
+            model=TAGLINE_MODEL,
             messages=[
                 {"role": "system", "content": "You are a marketing copywriter."},
                 {"role": "user", "content": prompt}
@@ -199,20 +310,21 @@ Tagline:"""
             max_tokens=30
         )
         
-        return response.choices[0].message.content.strip()
+        return text.strip()
     
-    def _generate_description(self, product: ProductModel) -> str:
+    async def _agenerate_description(self, product: ProductModel) -> str:
         """Generate product description"""
         prompt = f"""Write a compelling product description (3-4 sentences) for:
 Product: {product.name}
 Concentration: {product.concentration}
-Benefits: {', '.join(product.benefits)}
-Skin Types: {', '.join(product.skin_types)}
+Benefits: {product.benefits_text}
+Skin Types: {product.skin_types_text}
 
 Description:"""
         
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
+        text = await astream_completion(
+            get_async_openai_client(),
+            model=TAGLINE_MODEL,
             messages=[
                 {"role": "system", "content": "You are a product description writer."},
                 {"role": "user", "content": prompt}
@@ -221,7 +333,7 @@ Description:"""
             max_tokens=150
         )
         
-        return response.choices[0].message.content.strip()
+        return text.strip()
     
     def _fill_comparison_template(self, template: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Fill comparison template"""
@@ -264,6 +376,6 @@ Description:"""
         template["comparison_matrix"]["price_value"] = comp_data.get("price_value", "")
         
         template["recommendation"] = comp_data.get("recommendation", "")
-        template["metadata"]["generated_at"] = datetime.now().isoformat()
+        template["metadata"]["generated_at"] = self._generated_at(context)
         
         return template
@@ -3,8 +3,8 @@ Centralized Configuration
 All agents must import MODEL_NAME and get_openai_client from this file
 """
 import os
+import weakref
 from dotenv import load_dotenv
-import openai
 
 # Load environment variables
 load_dotenv()
@@ -17,32 +17,137 @@ if USE_OPENROUTER:
     API_KEY = os.getenv('OPENROUTER_API_KEY')
     API_BASE = "https://openrouter.ai/api/v1"
     MODEL_NAME = "nvidia/nemotron-3-nano-30b-a3b:free"  # Free NVIDIA model on OpenRouter
-    
-    if not API_KEY:
-        raise ValueError("OPENROUTER_API_KEY not found in environment variables. Get one free at https://openrouter.ai/keys")
 else:
     # OpenAI Configuration (PAID)
     API_KEY = os.getenv('OPENAI_API_KEY')
     API_BASE = "https://api.openai.com/v1"
     MODEL_NAME = "gpt-4o-mini"
-    
-    if not API_KEY:
-        raise ValueError("OPENAI_API_KEY not found in environment variables")
+
+
+def _require_api_key():
+    """Validate the API key on first client use, not at import
+
+    Import stays cheap for LLM-free paths (parsing-only runs, tests) and
+    the error still points at the missing variable when a client is
+    actually requested
+    """
+    if API_KEY:
+        return
+    if USE_OPENROUTER:
+        raise ValueError("OPENROUTER_API_KEY not found in environment variables. Get one free at https://openrouter.ai/keys")
+    raise ValueError("OPENAI_API_KEY not found in environment variables")
 
 # Model Parameters
 DEFAULT_TEMPERATURE = 0.7
 DEFAULT_MAX_TOKENS = 500
 
+# Per-task model overrides - factual answer generation can run on a
+# cheaper/faster model while creative copy stays on the default
+ANSWER_MODEL = os.getenv('ANSWER_MODEL', MODEL_NAME)
+TAGLINE_MODEL = os.getenv('TAGLINE_MODEL', MODEL_NAME)
+
+# Template-filling content blocks (usage, safety, fictional Product B)
+# tolerate a smaller model than the analysis-heavy ones
+FAST_MODEL_NAME = os.getenv('FAST_MODEL_NAME', MODEL_NAME)
+
+# Maximum number of LLM requests in flight at once (rate-limit friendly)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Per-request timeout and retry budget - a hung request fails after 30s
+# and is retried with the SDK's jittered exponential backoff instead of
+# stalling the whole pipeline on the default ~10 minute timeout
+REQUEST_TIMEOUT = 30.0
+CLIENT_MAX_RETRIES = 3
+
 # Legacy support (for backward compatibility)
 OPENAI_API_KEY = API_KEY
 
 
+# HTTP connection pool settings - generous keep-alive so concurrent
+# agents reuse warm TLS connections instead of re-handshaking per call
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+HTTP_MAX_CONNECTIONS = 100
+HTTP_KEEPALIVE_EXPIRY = 180.0
+
+
+def _http_limits():
+    """Build the shared connection-pool limits (httpx imported lazily)"""
+    import httpx
+    return httpx.Limits(
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        max_connections=HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
+
+# Singleton sync client - every agent shares one client (and one HTTP
+# connection pool) instead of constructing its own
+_sync_client = None
+
+
 def get_openai_client():
     """
     Get configured OpenAI client (works with both OpenAI and OpenRouter)
     All agents should use this function instead of creating their own client
+    Returns the same shared instance on every call
+    """
+    global _sync_client
+    if _sync_client is None:
+        # Imported here so LLM-free paths never pay the openai/httpx
+        # import cost
+        import httpx
+        import openai
+        _require_api_key()
+        _sync_client = openai.OpenAI(
+            api_key=API_KEY,
+            base_url=API_BASE,
+            http_client=httpx.Client(limits=_http_limits()),
+            timeout=REQUEST_TIMEOUT,
+            max_retries=CLIENT_MAX_RETRIES
+        )
+    return _sync_client
+
+
+# Async clients are cached per event loop - sharing one client across
+# concurrent tasks reuses its connection pool, but a client must not
+# outlive the loop it was created on. Weak keys mean a cache entry dies
+# with its loop instead of pinning it (and its connection pool) forever;
+# a finalizer closes the stranded client at that point
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _close_stranded_client(client):
+    """Best-effort close of a client whose event loop was torn down
+
+    The original loop is gone, so the close runs on a throwaway loop;
+    httpx tolerates this for idle pools, and any straggler is released
+    by the transport's own finalizers
+    """
+    import asyncio
+    try:
+        asyncio.run(client.close())
+    except Exception:
+        pass
+
+
+def get_async_openai_client():
+    """
+    Get configured AsyncOpenAI client for concurrent LLM calls
+    Cached per running event loop so all tasks share one connection pool
     """
-    return openai.OpenAI(
-        api_key=API_KEY,
-        base_url=API_BASE
-    )
\ No newline at end of file
+    import asyncio
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        import httpx
+        import openai
+        _require_api_key()
+        client = openai.AsyncOpenAI(
+            api_key=API_KEY,
+            base_url=API_BASE,
+            http_client=httpx.AsyncClient(limits=_http_limits()),
+            timeout=REQUEST_TIMEOUT,
+            max_retries=CLIENT_MAX_RETRIES
+        )
+        _async_clients[loop] = client
+        weakref.finalize(loop, _close_stranded_client, client)
+    return client
\ No newline at end of file
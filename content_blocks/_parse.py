@@ -0,0 +1,36 @@
+"""
+Robust JSON extraction for LLM responses
+Direct parse first, then salvage the first {...} from surrounding text
+"""
+import json
+import re
+from typing import Any, Dict
+
+# Greedy so nested objects are captured up to the final closing brace
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.S)
+
+
+def robust_json(text: str) -> Dict[str, Any]:
+    """
+    Parse a model response that should be a JSON object
+
+    Tolerates markdown code fences and trailing commentary around the
+    object - a failed strict parse retries on the first {...} span
+    rather than burning the completion on a retry call
+
+    Raises:
+        ValueError: If no parseable JSON object is found
+    """
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        pass
+
+    match = _JSON_OBJECT_RE.search(text or "")
+    if match:
+        try:
+            return json.loads(match.group(0))
+        except json.JSONDecodeError:
+            pass
+
+    raise ValueError(f"Response contains no parseable JSON object: {text!r}")
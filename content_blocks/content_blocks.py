@@ -2,291 +2,517 @@
 Content Logic Blocks - Reusable transformation logic
 Each block implements a specific content transformation strategy
 """
+import asyncio
 from typing import Dict, Any, List
-from models.data_models import ProductModel
-from config import MODEL_NAME, get_openai_client
+from models.data_models import ProductModel, to_columnar
+from config import (
+    MODEL_NAME, FAST_MODEL_NAME, MAX_CONCURRENT_REQUESTS,
+    get_openai_client, get_async_openai_client
+)
+from utils import llm_cache
+from utils.streaming import astream_completion
+from content_blocks._parse import robust_json
+
+
+# JSON-schema shorthand for the blocks' structured outputs. Describing the
+# shape to the server instead of pasting an example object into every prompt
+# trims the repeated scaffolding tokens and lets the API enforce the keys
+_STR = {"type": "string"}
+_NUM = {"type": "number"}
+_STR_LIST = {"type": "array", "items": _STR}
+
+
+def _object(**properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Strict object schema: every property required, no extras allowed"""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+
+def _array(items: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "array", "items": items}
 
 
 class ContentBlockInterface:
-    """Base interface for all content blocks"""
-    
-    def process(self, product: ProductModel, **kwargs) -> Dict[str, Any]:
+    """Base interface for all content blocks
+
+    Subclasses define SYSTEM_ROLE and _build_prompt; the base class owns
+    the sync and async call paths so independent blocks can be fanned
+    out with asyncio.gather instead of running back to back
+    """
+
+    SYSTEM_ROLE = "You are a skincare expert."
+    TEMPERATURE = 0.5
+
+    # Low-creativity template-filling blocks downgrade this to
+    # FAST_MODEL_NAME; analysis-heavy blocks keep the default
+    MODEL = MODEL_NAME
+
+    # Subclasses set a schema so the server enforces the response shape;
+    # None falls back to plain JSON mode
+    RESPONSE_SCHEMA: Dict[str, Any] = None
+
+    @property
+    def client(self):
+        """Shared sync client, resolved lazily on first use"""
+        return get_openai_client()
+
+    def _build_prompt(self, product: ProductModel, **kwargs) -> str:
         raise NotImplementedError
 
+    def _build_messages(self, product: ProductModel, **kwargs) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": f"{self.SYSTEM_ROLE} Respond only with valid JSON."},
+            {"role": "user", "content": self._build_prompt(product, **kwargs)}
+        ]
+
+    def _handle_response(self, content: str, **kwargs) -> Dict[str, Any]:
+        return robust_json(content)
+
+    def _response_format(self) -> Dict[str, Any]:
+        if self.RESPONSE_SCHEMA is None:
+            return {"type": "json_object"}
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": type(self).__name__,
+                "schema": self.RESPONSE_SCHEMA,
+                "strict": True
+            }
+        }
+
+    def _cache_key(self, messages: List[Dict[str, str]]) -> str:
+        """Exact-match cache key: block class, model and full prompt"""
+        return llm_cache.make_key(type(self).__name__, self.MODEL, messages)
+
+    def process(self, product: ProductModel, **kwargs) -> Dict[str, Any]:
+        """Synchronous single-block processing"""
+        messages = self._build_messages(product, **kwargs)
+
+        # Identical product + prompt replays skip the API entirely
+        key = self._cache_key(messages)
+        content = llm_cache.get(key)
+
+        if content is None:
+            response = self.client.chat.completions.create(
+                model=self.MODEL,
+                messages=messages,
+                temperature=self.TEMPERATURE,
+                response_format=self._response_format()
+            )
+            content = response.choices[0].message.content
+            llm_cache.put(key, content)
+
+        return self._handle_response(content, **kwargs)
+
+    async def aprocess(self, product: ProductModel, *,
+                       on_delta=None, **kwargs) -> Dict[str, Any]:
+        """Async processing - lets callers overlap independent blocks
+
+        Streams the completion; pass on_delta to observe tokens as they
+        arrive instead of waiting out the full generation in silence
+        """
+        messages = self._build_messages(product, **kwargs)
+
+        key = self._cache_key(messages)
+        content = llm_cache.get(key)
+
+        if content is None:
+            content = await astream_completion(
+                get_async_openai_client(),
+                on_delta=on_delta,
+                model=self.MODEL,
+                messages=messages,
+                temperature=self.TEMPERATURE,
+                response_format=self._response_format()
+            )
+            llm_cache.put(key, content)
+
+        return self._handle_response(content, **kwargs)
+
+
+async def gather_blocks(blocks: List[ContentBlockInterface], product: ProductModel,
+                        **kwargs) -> List[Dict[str, Any]]:
+    """Run independent blocks concurrently, bounded for rate-limit safety
+
+    Results come back in the same order as blocks; latency is the
+    slowest block instead of the sum of all of them
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def run_one(block: ContentBlockInterface) -> Dict[str, Any]:
+        async with semaphore:
+            return await block.aprocess(product, **kwargs)
+
+    return list(await asyncio.gather(*(run_one(b) for b in blocks)))
+
 
 class BenefitsBlock(ContentBlockInterface):
     """
     Transforms benefit keywords into detailed descriptions
     Maps benefits to skin concerns
     """
-    
-    def __init__(self):
-        self.client = get_openai_client()
-    
-    def process(self, product: ProductModel, **kwargs) -> Dict[str, Any]:
-        """Process benefits into structured content"""
-        
-        prompt = f"""Analyze these skincare benefits and provide detailed information:
-Benefits: {', '.join(product.benefits)}
-Product: {product.name}
+
+    SYSTEM_ROLE = "You are a skincare expert."
+
+    RESPONSE_SCHEMA = _object(
+        primary_benefit=_STR,
+        detailed_benefits=_array(_object(benefit=_STR, description=_STR)),
+        timeline=_STR,
+        concerns_addressed=_STR_LIST
+    )
+
+    PROMPT_TEMPLATE = """Analyze these skincare benefits and provide detailed information:
+Benefits: {benefits}
+Product: {name}
 
 Provide:
 1. Primary benefit (most important)
 2. Detailed explanation of each benefit (2-3 sentences each)
 3. Expected timeline for results
-4. Skin concerns addressed
-
-Format as JSON:
-{{
-    "primary_benefit": "...",
-    "detailed_benefits": [{{"benefit": "...", "description": "..."}}],
-    "timeline": "...",
-    "concerns_addressed": [...]
-}}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a skincare expert. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5
+4. Skin concerns addressed"""
+
+    def _build_prompt(self, product: ProductModel, **kwargs) -> str:
+        return self.PROMPT_TEMPLATE.format(
+            benefits=product.benefits_text,
+            name=product.name
         )
-        
-        import json
-        return json.loads(response.choices[0].message.content)
 
 
 class IngredientsBlock(ContentBlockInterface):
     """
     Explains ingredient functions and highlights key actives
     """
-    
-    def __init__(self):
-        self.client = get_openai_client()
-    
-    def process(self, product: ProductModel, **kwargs) -> Dict[str, Any]:
-        """Process ingredients into structured content"""
-        
-        prompt = f"""Analyze these skincare ingredients:
-Ingredients: {', '.join(product.ingredients)}
-Product: {product.name}
+
+    SYSTEM_ROLE = "You are a cosmetic chemist."
+
+    RESPONSE_SCHEMA = _object(
+        key_actives=_array(_object(name=_STR, function=_STR, concentration=_STR)),
+        ingredient_synergy=_STR,
+        notable_combinations=_STR_LIST
+    )
+
+    PROMPT_TEMPLATE = """Analyze these skincare ingredients:
+Ingredients: {ingredients}
+Product: {name}
 
 Provide:
 1. Key active ingredients (most important ones)
 2. Function of each ingredient
 3. Why these ingredients work together
-4. Any notable ingredient combinations
-
-Format as JSON:
-{{
-    "key_actives": [{{"name": "...", "function": "...", "concentration": "..."}}],
-    "ingredient_synergy": "...",
-    "notable_combinations": [...]
-}}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a cosmetic chemist. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5
+4. Any notable ingredient combinations"""
+
+    def _build_prompt(self, product: ProductModel, **kwargs) -> str:
+        return self.PROMPT_TEMPLATE.format(
+            ingredients=product.ingredients_text,
+            name=product.name
         )
-        
-        import json
-        return json.loads(response.choices[0].message.content)
 
 
 class UsageBlock(ContentBlockInterface):
     """
     Formats usage instructions with contextual tips
     """
-    
-    def __init__(self):
-        self.client = get_openai_client()
-    
-    def process(self, product: ProductModel, **kwargs) -> Dict[str, Any]:
-        """Process usage instructions into structured content"""
-        
-        prompt = f"""Create detailed usage instructions for this product:
-Product: {product.name}
-Basic Instructions: {product.usage_instructions}
-Skin Types: {', '.join(product.skin_types)}
+
+    SYSTEM_ROLE = "You are a skincare routine expert."
+
+    MODEL = FAST_MODEL_NAME
+
+    RESPONSE_SCHEMA = _object(
+        steps=_STR_LIST,
+        timing=_STR,
+        tips=_STR_LIST,
+        pair_with=_STR_LIST,
+        avoid_with=_STR_LIST
+    )
+
+    PROMPT_TEMPLATE = """Create detailed usage instructions for this product:
+Product: {name}
+Basic Instructions: {instructions}
+Skin Types: {skin_types}
 
 Provide:
 1. Step-by-step application guide
 2. Best time to use (AM/PM)
 3. Tips for maximum effectiveness
 4. What to pair it with
-5. What to avoid using with it
-
-Format as JSON:
-{{
-    "steps": ["step 1", "step 2", ...],
-    "timing": "...",
-    "tips": [...],
-    "pair_with": [...],
-    "avoid_with": [...]
-}}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a skincare routine expert. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5
+5. What to avoid using with it"""
+
+    def _build_prompt(self, product: ProductModel, **kwargs) -> str:
+        return self.PROMPT_TEMPLATE.format(
+            name=product.name,
+            instructions=product.usage_instructions,
+            skin_types=product.skin_types_text
         )
-        
-        import json
-        return json.loads(response.choices[0].message.content)
 
 
 class SafetyBlock(ContentBlockInterface):
     """
     Processes side effects and generates safety information
     """
-    
-    def __init__(self):
-        self.client = get_openai_client()
-    
-    def process(self, product: ProductModel, **kwargs) -> Dict[str, Any]:
-        """Process safety information"""
-        
-        prompt = f"""Analyze safety information for this product:
-Product: {product.name}
-Side Effects: {product.side_effects}
-Skin Types: {', '.join(product.skin_types)}
+
+    SYSTEM_ROLE = "You are a dermatology safety expert."
+
+    MODEL = FAST_MODEL_NAME
+
+    RESPONSE_SCHEMA = _object(
+        side_effects=_array(_object(effect=_STR, management=_STR)),
+        contraindications=_STR_LIST,
+        patch_test=_STR,
+        warning_signs=_STR_LIST
+    )
+
+    PROMPT_TEMPLATE = """Analyze safety information for this product:
+Product: {name}
+Side Effects: {side_effects}
+Skin Types: {skin_types}
 
 Provide:
 1. Common side effects and how to manage them
 2. Who should avoid this product
 3. Patch test recommendations
-4. Warning signs to watch for
-
-Format as JSON:
-{{
-    "side_effects": [{{"effect": "...", "management": "..."}}],
-    "contraindications": [...],
-    "patch_test": "...",
-    "warning_signs": [...]
-}}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a dermatology safety expert. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5
+4. Warning signs to watch for"""
+
+    def _build_prompt(self, product: ProductModel, **kwargs) -> str:
+        return self.PROMPT_TEMPLATE.format(
+            name=product.name,
+            side_effects=product.side_effects,
+            skin_types=product.skin_types_text
         )
-        
-        import json
-        return json.loads(response.choices[0].message.content)
+
+
+class CombinedProductBlock(ContentBlockInterface):
+    """
+    Produces benefits, ingredients, usage and safety content in one call
+
+    The four product-page blocks repeat the same product context per
+    request; fusing them shares one round-trip and one prefill. The
+    response carries each section under its own key, matching the
+    individual blocks' schemas
+    """
+
+    SYSTEM_ROLE = "You are a skincare expert."
+
+    SECTIONS = ("benefits", "ingredients", "usage", "safety")
+
+    # Each section keeps the matching individual block's schema, so the
+    # fused result splits cleanly into per-block entries
+    RESPONSE_SCHEMA = _object(
+        benefits=BenefitsBlock.RESPONSE_SCHEMA,
+        ingredients=IngredientsBlock.RESPONSE_SCHEMA,
+        usage=UsageBlock.RESPONSE_SCHEMA,
+        safety=SafetyBlock.RESPONSE_SCHEMA
+    )
+
+    PROMPT_TEMPLATE = """Analyze this skincare product:
+Product: {name}
+Concentration: {concentration}
+Ingredients: {ingredients}
+Benefits: {benefits}
+Usage: {usage}
+Side Effects: {side_effects}
+Skin Types: {skin_types}
+
+Provide four content sections:
+1. benefits - primary benefit, detailed explanation of each benefit (2-3 sentences each), expected timeline, skin concerns addressed
+2. ingredients - key active ingredients with functions, why they work together, notable combinations
+3. usage - step-by-step application guide, best time to use (AM/PM), tips, what to pair with, what to avoid
+4. safety - common side effects and management, who should avoid it, patch test recommendation, warning signs"""
+
+    def _build_prompt(self, product: ProductModel, **kwargs) -> str:
+        return self.PROMPT_TEMPLATE.format(
+            name=product.name,
+            concentration=product.concentration,
+            ingredients=product.ingredients_text,
+            benefits=product.benefits_text,
+            usage=product.usage_instructions,
+            side_effects=product.side_effects,
+            skin_types=product.skin_types_text
+        )
+
+    def _handle_response(self, content: str, **kwargs) -> Dict[str, Any]:
+        result = robust_json(content)
+        missing = [s for s in self.SECTIONS if s not in result]
+        if missing:
+            raise ValueError(f"Combined block response missing sections: {missing}")
+        return result
 
 
 class ComparisonBlock(ContentBlockInterface):
     """
     Compares two products and highlights differences
     """
-    
+
+    SYSTEM_ROLE = "You are a product comparison expert."
+
     def __init__(self):
-        self.client = get_openai_client()
-    
+        # The fictional competitor only depends on Product A's identity;
+        # memoize it so repeat comparisons don't pay a second LLM call
+        self._product_b_memo: Dict[str, Dict[str, Any]] = {}
+
+    _VERDICT = _object(name=_STR, strengths=_STR_LIST, weaknesses=_STR_LIST)
+
+    RESPONSE_SCHEMA = _object(
+        product_a=_VERDICT,
+        product_b=_VERDICT,
+        key_differences=_STR_LIST,
+        similarities=_STR_LIST,
+        best_for=_object(product_a=_STR_LIST, product_b=_STR_LIST),
+        price_value=_STR,
+        recommendation=_STR
+    )
+
+    PRODUCT_B_SCHEMA = _object(
+        name=_STR,
+        concentration=_STR,
+        ingredients=_STR_LIST,
+        benefits=_STR_LIST,
+        price=_NUM,
+        currency=_STR,
+        skin_types=_STR_LIST
+    )
+
     def process(self, product: ProductModel, **kwargs) -> Dict[str, Any]:
         """Compare two products"""
-        product_b = kwargs.get('product_b')
-        
-        if not product_b:
+        if not kwargs.get('product_b'):
             # Generate fictional Product B
-            product_b = self._generate_product_b(product)
-        
-        prompt = f"""Compare these two skincare products:
-
-Product A: {product.name}
-- Concentration: {product.concentration}
-- Ingredients: {', '.join(product.ingredients)}
-- Benefits: {', '.join(product.benefits)}
-- Price: {product.currency} {product.price}
-- Skin Types: {', '.join(product.skin_types)}
-
-Product B: {product_b['name']}
-- Concentration: {product_b['concentration']}
-- Ingredients: {', '.join(product_b['ingredients'])}
-- Benefits: {', '.join(product_b['benefits'])}
-- Price: {product_b['currency']} {product_b['price']}
-- Skin Types: {', '.join(product_b['skin_types'])}
+            kwargs['product_b'] = self._generate_product_b(product)
+        return super().process(product, **kwargs)
+
+    async def aprocess(self, product: ProductModel, **kwargs) -> Dict[str, Any]:
+        """Async comparison - Product B generation stays sequential"""
+        if not kwargs.get('product_b'):
+            kwargs['product_b'] = await self._agenerate_product_b(product)
+        return await super().aprocess(product, **kwargs)
+
+    PROMPT_TEMPLATE = """Compare these two skincare products.
+Table below: header row names the fields, Product A is the first data row, Product B the second.
+
+{product_table}
 
 Provide:
 1. Key differences
 2. Similarities
 3. Which is better for specific concerns
 4. Price-value comparison
-5. Recommendation
-
-Format as JSON:
-{{
-    "product_a": {{"name": "...", "strengths": [...], "weaknesses": [...]}},
-    "product_b": {{"name": "...", "strengths": [...], "weaknesses": [...]}},
-    "key_differences": [...],
-    "similarities": [...],
-    "best_for": {{"product_a": [...], "product_b": [...]}},
-    "price_value": "...",
-    "recommendation": "..."
-}}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a product comparison expert. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5
+5. Recommendation"""
+
+    def _build_prompt(self, product: ProductModel, **kwargs) -> str:
+        product_b = kwargs['product_b']
+        return self.PROMPT_TEMPLATE.format(
+            product_table=to_columnar([product, self._product_b_model(product_b)])
+        )
+
+    @staticmethod
+    def _product_b_model(product_b: Dict[str, Any]) -> ProductModel:
+        """Lift the generated competitor dict into a ProductModel row"""
+        return ProductModel(
+            name=product_b['name'],
+            concentration=product_b['concentration'],
+            skin_types=product_b['skin_types'],
+            ingredients=product_b['ingredients'],
+            benefits=product_b['benefits'],
+            usage_instructions='',
+            side_effects='',
+            price=product_b['price'],
+            currency=product_b['currency']
         )
-        
-        import json
-        result = json.loads(response.choices[0].message.content)
-        result['product_b_data'] = product_b
+
+    def _handle_response(self, content: str, **kwargs) -> Dict[str, Any]:
+        result = robust_json(content)
+        result['product_b_data'] = kwargs['product_b']
         return result
-    
-    def _generate_product_b(self, product_a: ProductModel) -> Dict[str, Any]:
-        """Generate fictional Product B for comparison"""
-        
-        prompt = f"""Create a fictional competing product to compare with:
-Product A: {product_a.name}
-- Concentration: {product_a.concentration}
-- Price: {product_a.currency} {product_a.price}
+
+    PRODUCT_B_TEMPLATE = """Create a fictional competing product to compare with:
+Product A: {name}
+- Concentration: {concentration}
+- Price: {currency} {price}
 
 Create Product B with:
 - Similar category but different formulation
 - Different concentration
-- Different price point
+- Different price point in INR
 - Different ingredient mix
-- Realistic product name
-
-Format as JSON:
-{{
-    "name": "...",
-    "concentration": "...",
-    "ingredients": [...],
-    "benefits": [...],
-    "price": number,
-    "currency": "INR",
-    "skin_types": [...]
-}}"""
-        
-        response = self.client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a product developer. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7
+- Realistic product name"""
+
+    def _product_b_prompt(self, product_a: ProductModel) -> str:
+        return self.PRODUCT_B_TEMPLATE.format(
+            name=product_a.name,
+            concentration=product_a.concentration,
+            currency=product_a.currency,
+            price=product_a.price
+        )
+
+    def _product_b_messages(self, product_a: ProductModel) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": "You are a product developer. Respond only with valid JSON."},
+            {"role": "user", "content": self._product_b_prompt(product_a)}
+        ]
+
+    def _product_b_key(self, product_a: ProductModel) -> str:
+        """Competitor cache key: Product A's identity and the model"""
+        return llm_cache.make_key(
+            'product_b', FAST_MODEL_NAME,
+            product_a.name, product_a.concentration, product_a.price
         )
-        
-        import json
-        return json.loads(response.choices[0].message.content)
+
+    def _cached_product_b(self, key: str) -> Dict[str, Any]:
+        """Check the in-process memo, then the disk cache"""
+        cached = self._product_b_memo.get(key)
+        if cached is None:
+            cached = llm_cache.get(key)
+            if cached is not None:
+                self._product_b_memo[key] = cached
+        return cached
+
+    def _store_product_b(self, key: str, product_b: Dict[str, Any]) -> None:
+        self._product_b_memo[key] = product_b
+        llm_cache.put(key, product_b)
+
+    def _generate_product_b(self, product_a: ProductModel) -> Dict[str, Any]:
+        """Generate fictional Product B for comparison"""
+        key = self._product_b_key(product_a)
+        product_b = self._cached_product_b(key)
+        if product_b is None:
+            response = self.client.chat.completions.create(
+                model=FAST_MODEL_NAME,
+                messages=self._product_b_messages(product_a),
+                temperature=0.7,
+                response_format=self._product_b_response_format()
+            )
+            product_b = robust_json(response.choices[0].message.content)
+            self._store_product_b(key, product_b)
+        return product_b
+
+    async def _agenerate_product_b(self, product_a: ProductModel) -> Dict[str, Any]:
+        """Async variant of _generate_product_b"""
+        key = self._product_b_key(product_a)
+        product_b = self._cached_product_b(key)
+        if product_b is None:
+            content = await astream_completion(
+                get_async_openai_client(),
+                model=FAST_MODEL_NAME,
+                messages=self._product_b_messages(product_a),
+                temperature=0.7,
+                response_format=self._product_b_response_format()
+            )
+            product_b = robust_json(content)
+            self._store_product_b(key, product_b)
+        return product_b
+
+    @classmethod
+    def _product_b_response_format(cls) -> Dict[str, Any]:
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "ProductB",
+                "schema": cls.PRODUCT_B_SCHEMA,
+                "strict": True
+            }
+        }
 
 
 # Registry of all content blocks
@@ -295,5 +521,6 @@ CONTENT_BLOCKS = {
     "ingredients": IngredientsBlock(),
     "usage": UsageBlock(),
     "safety": SafetyBlock(),
+    "combined": CombinedProductBlock(),
     "comparison": ComparisonBlock()
 }
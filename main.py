@@ -69,9 +69,12 @@ def main():
         # Execute workflow
         outputs = orchestrator.execute(PRODUCT_DATA)
         
-        # Save outputs
+        # Save outputs - block on the write futures so a failed write
+        # (permissions, disk full) lands in the error handler below
+        # instead of vanishing inside the background pool
         print("\n💾 Saving outputs...")
-        orchestrator.save_outputs(outputs)
+        for future in orchestrator.save_outputs(outputs):
+            future.result()
         
         print("\n" + "="*60)
         print("✅ SUCCESS! All pages generated successfully")
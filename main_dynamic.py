@@ -4,21 +4,17 @@ Demonstrates true agent autonomy with dynamic coordination
 """
 import os
 import sys
-import json
 from dotenv import load_dotenv
 
+from utils.json_io import json_dumps
+
 # Import dynamic orchestrator
 from orchestrator.dynamic_orchestrator import DynamicOrchestrator
 
 # Import autonomous agents
 from agents.autonomous.data_parser_agent import AutonomousDataParserAgent
 from agents.autonomous.question_generator_agent import AutonomousQuestionGeneratorAgent
-from agents.autonomous.content_processor_agents import (
-    BenefitsProcessorAgent,
-    IngredientsProcessorAgent,
-    UsageProcessorAgent,
-    SafetyProcessorAgent
-)
+from agents.autonomous.content_processor_agents import CombinedContentProcessorAgent
 from agents.autonomous.template_filler_agents import (
     FAQTemplateAgent,
     ProductPageTemplateAgent,
@@ -92,10 +88,8 @@ def main():
         # Note: Order doesn't matter - orchestrator figures it out!
         orchestrator.register_agent(AutonomousDataParserAgent())
         orchestrator.register_agent(AutonomousQuestionGeneratorAgent())
-        orchestrator.register_agent(BenefitsProcessorAgent())
-        orchestrator.register_agent(IngredientsProcessorAgent())
-        orchestrator.register_agent(UsageProcessorAgent())
-        orchestrator.register_agent(SafetyProcessorAgent())
+        # Single fused processor - one LLM call for all four content sections
+        orchestrator.register_agent(CombinedContentProcessorAgent())
         orchestrator.register_agent(FAQTemplateAgent())
         orchestrator.register_agent(ProductPageTemplateAgent())
         orchestrator.register_agent(ComparisonTemplateAgent())
@@ -142,7 +136,7 @@ def main():
                 filepath = os.path.join(output_dir, filename)
                 
                 with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                    f.write(json_dumps(data, indent=True))
                 
                 print(f"  ✓ Saved: {filepath}")
         else:
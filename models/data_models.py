@@ -1,13 +1,29 @@
 """
 Data Models for the Multi-Agent Content Generation System
+
+All dataclasses use slots=True: fixed attribute offsets instead of a
+per-instance __dict__, which shrinks instances and speeds up attribute
+access in the per-question and per-message hot paths
 """
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from dataclasses import asdict, dataclass, field
+from typing import Any, ClassVar, Dict, List, Optional
 from datetime import datetime
-import json
+import re
+
+# Price strings arrive as "₹699" / "$69.99" - one C-level regex scan
+# extracts the numeric part with decimals intact
+_PRICE_RE = re.compile(r'(\d+\.?\d*)')
+
+# Currency symbol -> ISO code, checked in order of appearance
+_CURRENCY_SYMBOLS = {
+    '₹': 'INR',
+    '$': 'USD',
+    '€': 'EUR',
+    '£': 'GBP'
+}
 
 
-@dataclass
+@dataclass(slots=True)
 class ProductModel:
     """
     Core product data model with validation and serialization
@@ -21,20 +37,24 @@ class ProductModel:
     side_effects: str
     price: float
     currency: str = "INR"
-    
+    # Comma-joined views of the list fields, computed once at construction.
+    # Prompt builders interpolate these instead of re-joining the same
+    # lists on every LLM call
+    skin_types_text: str = field(init=False, repr=False, compare=False, default="")
+    ingredients_text: str = field(init=False, repr=False, compare=False, default="")
+    benefits_text: str = field(init=False, repr=False, compare=False, default="")
+
+    def __post_init__(self):
+        self.skin_types_text = ', '.join(self.skin_types)
+        self.ingredients_text = ', '.join(self.ingredients)
+        self.benefits_text = ', '.join(self.benefits)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        return {
-            "name": self.name,
-            "concentration": self.concentration,
-            "skin_types": self.skin_types,
-            "ingredients": self.ingredients,
-            "benefits": self.benefits,
-            "usage_instructions": self.usage_instructions,
-            "side_effects": self.side_effects,
-            "price": self.price,
-            "currency": self.currency
-        }
+        data = asdict(self)
+        # The *_text views are derived; serialize only the source fields
+        del data['skin_types_text'], data['ingredients_text'], data['benefits_text']
+        return data
     
     def validate(self) -> bool:
         """Validate required fields"""
@@ -52,10 +72,21 @@ class ProductModel:
         ingredients = [i.strip() for i in data.get('key_ingredients', '').split(',')]
         benefits = [b.strip() for b in data.get('benefits', '').split(',')]
         
-        # Extract price and currency
-        price_str = data.get('price', '₹0')
-        price = float(''.join(filter(str.isdigit, price_str)))
-        currency = 'INR' if '₹' in price_str else 'USD'
+        # Extract price and currency - pre-parsed numeric prices skip
+        # the regex entirely; string prices keep the decimal-aware
+        # match (the old per-character isdigit filter read "₹69.99"
+        # as 6999)
+        price_value = data.get('price', '₹0')
+        if isinstance(price_value, (int, float)):
+            price = float(price_value)
+            currency = data.get('currency', 'USD')
+        else:
+            match = _PRICE_RE.search(price_value.replace(',', ''))
+            price = float(match.group(1)) if match else 0.0
+            currency = next(
+                (code for symbol, code in _CURRENCY_SYMBOLS.items() if symbol in price_value),
+                'USD'
+            )
         
         return cls(
             name=data.get('product_name', ''),
@@ -70,7 +101,32 @@ class ProductModel:
         )
 
 
-@dataclass
+# Column order for to_columnar - schema appears once in the header row
+_COLUMNAR_FIELDS = ('name', 'concentration', 'ingredients', 'benefits',
+                    'price', 'skin_types')
+
+
+def to_columnar(products: List['ProductModel']) -> str:
+    """Render products as a pipe-delimited table, one row per product
+
+    Multi-product prompts repeat the same field labels per product; a
+    schema-once header plus value rows carries the same information in
+    roughly half the tokens
+    """
+    rows = [' | '.join(_COLUMNAR_FIELDS)]
+    for product in products:
+        rows.append(' | '.join((
+            product.name,
+            product.concentration,
+            product.ingredients_text,
+            product.benefits_text,
+            f"{product.currency} {product.price}",
+            product.skin_types_text
+        )))
+    return '\n'.join(rows)
+
+
+@dataclass(slots=True)
 class Question:
     """
     Question model with category and priority
@@ -83,16 +139,10 @@ class Question:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "category": self.category,
-            "question": self.question,
-            "answer": self.answer,
-            "priority": self.priority
-        }
+        return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlock:
     """
     Reusable content block with metadata
@@ -104,33 +154,83 @@ class ContentBlock:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "block_type": self.block_type,
-            "input_data": self.input_data,
-            "output_data": self.output_data,
-            "metadata": self.metadata
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class OrchestrationContext:
+    """
+    Typed execution context for the DAG pipeline
+
+    The known pipeline fields live in slots, so the orchestrator reads
+    and writes them as plain attributes (faster than dict keying, and a
+    typo is an AttributeError instead of a silent miss). Dict-style
+    get/[] access still works for agents that treat the context as a
+    mapping; unknown keys fall through to the extras dict
+    """
+    raw_product_data: Optional[Dict[str, Any]] = None
+    generated_at: Optional[str] = None
+    product: Any = None
+    questions: Any = None
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+    _FIELDS: ClassVar[frozenset] = frozenset(
+        ('raw_product_data', 'generated_at', 'product', 'questions')
+    )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Mapping-style read: slot fields first, then extras"""
+        if key in self._FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extras.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELDS:
+            return getattr(self, key)
+        return self.extras[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extras[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._FIELDS:
+            return getattr(self, key) is not None
+        return key in self.extras
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Flatten slot fields and extras into a plain dict"""
+        data = {
+            name: getattr(self, name)
+            for name in self._FIELDS
+            if getattr(self, name) is not None
         }
+        data.update(self.extras)
+        return data
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionState:
     """
     Tracks execution state across agents
     """
-    context: Dict[str, Any] = field(default_factory=dict)
+    context: OrchestrationContext = field(default_factory=OrchestrationContext)
     completed_agents: List[str] = field(default_factory=list)
     errors: List[Dict[str, Any]] = field(default_factory=list)
     start_time: datetime = field(default_factory=datetime.now)
-    
+
     def update(self, agent_name: str, result: Any):
         """Update state with agent result"""
         self.context[agent_name] = result
         self.completed_agents.append(agent_name)
-    
-    def get_context(self) -> Dict[str, Any]:
+
+    def get_context(self) -> OrchestrationContext:
         """Get current execution context"""
         return self.context
-    
+
     def add_error(self, agent_name: str, error: Exception):
         """Log error"""
         self.errors.append({
@@ -138,13 +238,13 @@ class ExecutionState:
             "error": str(error),
             "timestamp": datetime.now().isoformat()
         })
-    
+
     def get_outputs(self) -> Dict[str, Any]:
         """Get all outputs"""
-        return self.context
+        return self.context.as_dict()
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
     """
     Standard agent result wrapper
@@ -157,10 +257,4 @@ class AgentResult:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "agent_name": self.agent_name,
-            "success": self.success,
-            "data": self.data,
-            "error": self.error,
-            "execution_time": self.execution_time
-        }
+        return asdict(self)
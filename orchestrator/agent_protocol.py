@@ -3,10 +3,19 @@ Agent Communication Protocol
 Defines message types and communication patterns for agent interaction
 """
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field
+from collections import defaultdict, deque
+from itertools import islice
+from utils.json_io import json_dumps
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 from datetime import datetime
+import os
 import uuid
+from typing import Iterator
+
+# Upper bound on retained message history - keeps audit memory flat on
+# long-running buses, tunable per deployment
+MESSAGE_HISTORY_MAXLEN = int(os.getenv('MESSAGE_HISTORY_MAX', '10000'))
 
 
 class MessageType(Enum):
@@ -28,7 +37,16 @@ class AgentCapability(Enum):
     VALIDATE_OUTPUT = "validate_output"
 
 
-@dataclass
+def _jsonable(value: Any) -> Any:
+    """Flatten enums (including inside lists) to their values"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+@dataclass(slots=True)
 class Message:
     """Message passed between agents"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -36,25 +54,23 @@ class Message:
     sender: str = ""
     receiver: Optional[str] = None  # None = broadcast
     capability: Optional[AgentCapability] = None
+    # A result message covering several capabilities carries them all
+    # here so the sender publishes once; capability mirrors the first
+    # entry for older callers
+    capabilities: List[AgentCapability] = field(default_factory=list)
     payload: Dict[str, Any] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
-    
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "type": self.type.value,
-            "sender": self.sender,
-            "receiver": self.receiver,
-            "capability": self.capability.value if self.capability else None,
-            "payload": self.payload,
-            "metadata": self.metadata,
-            "timestamp": self.timestamp
-        }
-
-
-@dataclass
+        # Enum fields flatten to their values so the result is JSON-ready
+        return asdict(self, dict_factory=lambda pairs: {
+            key: _jsonable(value) for key, value in pairs
+        })
+
+
+@dataclass(slots=True)
 class AgentRegistration:
     """Agent registration information"""
     agent_id: str
@@ -74,11 +90,49 @@ class AgentRegistration:
 class MessageBus:
     """Central message bus for agent communication"""
     
-    def __init__(self):
-        self.messages: List[Message] = []
+    def __init__(self, debug_log_path: Optional[str] = None):
+        # One mailbox deque per agent, routed at publish time: a direct
+        # message lands in its receiver's mailbox, a broadcast fans out
+        # to the capability's subscribers. Receiving is then a single
+        # drain of the agent's own deque - no scan over shared queues.
+        # Agents must subscribe before the first publish they care about
+        self._mailboxes: Dict[str, deque] = defaultdict(deque)
         self.subscribers: Dict[str, List[str]] = {}  # capability -> [agent_ids]
-        self.message_history: List[Message] = []
-    
+        # Bounded ring buffer: memory stays constant however long the
+        # orchestrator lives; old messages fall off the front. Anyone
+        # needing the full record opts into the append-only debug log
+        self.message_history: deque = deque(maxlen=MESSAGE_HISTORY_MAXLEN)
+        self._debug_log = None
+        debug_log_path = debug_log_path or os.getenv('MESSAGE_DEBUG_LOG')
+        if debug_log_path:
+            # Line-buffered so every record hits disk even if close()
+            # is never reached (the log exists for post-mortems)
+            self._debug_log = open(debug_log_path, 'a', buffering=1,
+                                   encoding='utf-8')
+
+    def close(self):
+        """Release the debug log handle, if one was opened
+
+        Safe to call more than once; the bus keeps working afterwards,
+        it just stops spilling messages to disk
+        """
+        if self._debug_log is not None:
+            self._debug_log.close()
+            self._debug_log = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # Backstop for buses that were never closed explicitly
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def subscribe(self, agent_id: str, capability: AgentCapability):
         """Subscribe agent to messages for a capability"""
         cap_key = capability.value
@@ -86,31 +140,72 @@ class MessageBus:
             self.subscribers[cap_key] = []
         if agent_id not in self.subscribers[cap_key]:
             self.subscribers[cap_key].append(agent_id)
-    
+
     def publish(self, message: Message):
         """Publish message to bus"""
-        self.messages.append(message)
+        if message.receiver is not None:
+            self._mailboxes[message.receiver].append(message)
+        else:
+            capabilities = message.capabilities or (
+                [message.capability] if message.capability is not None else []
+            )
+            # One delivery per subscriber even when it listens to
+            # several of the message's capabilities
+            delivered = set()
+            for capability in capabilities:
+                for subscriber in self.subscribers.get(capability.value, ()):
+                    if subscriber != message.sender and subscriber not in delivered:
+                        delivered.add(subscriber)
+                        self._mailboxes[subscriber].append(message)
         self.message_history.append(message)
-    
-    def get_messages_for(self, agent_id: str, capability: Optional[AgentCapability] = None) -> List[Message]:
-        """Get messages for an agent"""
-        messages = []
-        for msg in self.messages:
-            # Direct messages
-            if msg.receiver == agent_id:
-                messages.append(msg)
-            # Broadcast messages for subscribed capabilities
-            elif msg.receiver is None and capability and msg.capability == capability:
-                messages.append(msg)
+        if self._debug_log is not None:
+            self._debug_log.write(json_dumps(message.to_dict()) + '\n')
+
+    def drain(self, agent_id: str) -> List[Message]:
+        """Take every pending message for an agent in one shot
+
+        deque.append/popleft are atomic under the GIL, so producers on
+        other threads can keep publishing while the owner drains
+        """
+        mailbox = self._mailboxes.get(agent_id)
+        messages: List[Message] = []
+        if mailbox:
+            while mailbox:
+                messages.append(mailbox.popleft())
         return messages
-    
+
+    def get_messages_for(self, agent_id: str, capability: Optional[AgentCapability] = None) -> List[Message]:
+        """Peek at an agent's pending messages without consuming them"""
+        return list(self._mailboxes.get(agent_id, ()))
+
     def clear_messages_for(self, agent_id: str):
         """Clear processed messages for an agent"""
-        self.messages = [m for m in self.messages if m.receiver != agent_id]
+        self._mailboxes.pop(agent_id, None)
     
     def get_history(self) -> List[Message]:
-        """Get message history"""
-        return self.message_history.copy()
+        """Get a snapshot copy of the message history"""
+        return list(self.message_history)
+
+    def iter_history(self) -> Iterator[Message]:
+        """Stream the history without the O(N) snapshot copy
+
+        For audit paths that only walk the messages once; callers that
+        mutate the bus while iterating should use get_history instead
+        """
+        return iter(self.message_history)
+
+    def history_size(self) -> int:
+        """Number of messages currently retained in the history"""
+        return len(self.message_history)
+
+    def recent_history(self, n: int) -> List[Message]:
+        """The last n messages, oldest first, without copying the rest"""
+        return list(islice(reversed(self.message_history), n))[::-1]
+
+    def history_snapshot(self) -> tuple:
+        """Immutable snapshot of the retained history for safe iteration
+        while other threads keep publishing"""
+        return tuple(self.message_history)
 
 
 class AgentRegistry:
@@ -118,18 +213,23 @@ class AgentRegistry:
     
     def __init__(self):
         self.agents: Dict[str, AgentRegistration] = {}
+        # Reverse index maintained at registration - capability lookups
+        # on the dispatch path never rescan every agent
+        self._by_capability: Dict[AgentCapability, List[str]] = defaultdict(list)
     
     def register(self, registration: AgentRegistration):
         """Register an agent"""
+        previous = self.agents.get(registration.agent_id)
+        if previous is not None:
+            for capability in previous.capabilities:
+                self._by_capability[capability].remove(previous.agent_id)
         self.agents[registration.agent_id] = registration
+        for capability in registration.capabilities:
+            self._by_capability[capability].append(registration.agent_id)
     
     def find_agents_for(self, capability: AgentCapability) -> List[str]:
         """Find agents that can handle a capability"""
-        return [
-            agent_id 
-            for agent_id, reg in self.agents.items() 
-            if reg.can_handle(capability)
-        ]
+        return list(self._by_capability.get(capability, ()))
     
     def get_dependencies(self, agent_id: str) -> List[AgentCapability]:
         """Get dependencies for an agent"""
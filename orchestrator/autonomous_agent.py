@@ -2,12 +2,30 @@
 Autonomous Agent Base Class
 Agents are independent, communicate via messages, and make their own decisions
 """
+from enum import Enum
 from typing import Dict, Any, List, Optional
 from abc import ABC, abstractmethod
 from orchestrator.agent_protocol import (
-    Message, MessageType, AgentCapability, 
+    Message, MessageType, AgentCapability,
     MessageBus, AgentRegistration
 )
+from utils import llm_cache
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def _canonical(value: Any) -> Any:
+    """Reduce a shared-state value to a JSON-serializable shape for hashing"""
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, 'to_dict'):
+        return _canonical(value.to_dict())
+    return value
 
 
 class AutonomousAgent(ABC):
@@ -20,8 +38,22 @@ class AutonomousAgent(ABC):
     3. Agents decide when and how to act
     4. Agents can work in parallel
     """
-    
-    def __init__(self, agent_id: str, capabilities: List[AgentCapability], 
+
+    # No per-instance __dict__: agents are numerous and long-lived, and
+    # hot execute/can_execute loops read these attributes constantly.
+    # Subclasses must declare __slots__ too (listing any extra fields)
+    # or they silently regain the dict
+    __slots__ = ('agent_id', 'capabilities', 'dependencies',
+                 'message_bus', 'state', 'is_active', '_result_cache',
+                 '_dep_keys', '_cap_values')
+
+    # Shared-state keys that determine this agent's output. Subclasses
+    # may override; None means "the dependency capability names". When
+    # the resulting key set is empty, memoization is skipped - an agent
+    # whose inputs we cannot see must not be assumed idempotent
+    relevant_state_keys: Optional[List[str]] = None
+
+    def __init__(self, agent_id: str, capabilities: List[AgentCapability],
                  dependencies: List[AgentCapability] = None):
         self.agent_id = agent_id
         self.capabilities = capabilities
@@ -29,6 +61,13 @@ class AutonomousAgent(ABC):
         self.message_bus: Optional[MessageBus] = None
         self.state = {}
         self.is_active = False
+        # Memoized results keyed by a hash of the relevant state slice -
+        # re-runs with unchanged inputs skip process() entirely
+        self._result_cache: Dict[str, Dict[str, Any]] = {}
+        # Enum .value lookups hoisted out of the scheduler's per-check
+        # loops - capabilities/dependencies never change after init
+        self._dep_keys = tuple(d.value for d in self.dependencies)
+        self._cap_values = tuple(c.value for c in self.capabilities)
         
     def register(self, message_bus: MessageBus):
         """Register agent with message bus"""
@@ -38,7 +77,8 @@ class AutonomousAgent(ABC):
         for capability in self.capabilities:
             message_bus.subscribe(self.agent_id, capability)
         
-        print(f"✓ Registered {self.agent_id} with capabilities: {[c.value for c in self.capabilities]}")
+        logger.info("✓ Registered %s with capabilities: %s",
+                    self.agent_id, [c.value for c in self.capabilities])
     
     def get_registration(self) -> AgentRegistration:
         """Get agent registration info"""
@@ -59,29 +99,44 @@ class AutonomousAgent(ABC):
         Returns:
             True if all dependencies are satisfied
         """
-        for dep in self.dependencies:
-            dep_key = dep.value
-            if dep_key not in shared_state:
-                return False
-        return True
-    
+        return all(key in shared_state for key in self._dep_keys)
+
+    def _state_key(self, shared_state: Dict[str, Any]) -> Optional[str]:
+        """
+        Hash the slice of shared_state this agent's output depends on
+
+        Returns:
+            Cache key, or None when the agent declares no relevant keys
+        """
+        keys = self.relevant_state_keys
+        if keys is None:
+            keys = self._dep_keys
+        if not keys:
+            return None
+        relevant = {k: _canonical(shared_state.get(k)) for k in sorted(keys)}
+        return llm_cache.make_key(self.agent_id, relevant)
+
+    def invalidate(self, capability: Optional[AgentCapability] = None):
+        """
+        Drop memoized results to force a fresh process() on next execute
+
+        Args:
+            capability: Only invalidate if this agent serves it; None
+                clears unconditionally
+        """
+        if capability is None or capability in self.capabilities:
+            self._result_cache.clear()
+
     def receive_messages(self) -> List[Message]:
-        """Receive messages from bus"""
+        """Receive messages from bus
+
+        The bus routes both direct and broadcast messages into this
+        agent's mailbox at publish time, so one drain collects them all
+        """
         if not self.message_bus:
             return []
-        
-        messages = []
-        for capability in self.capabilities:
-            messages.extend(
-                self.message_bus.get_messages_for(self.agent_id, capability)
-            )
-        
-        # Also get direct messages
-        messages.extend(
-            self.message_bus.get_messages_for(self.agent_id, None)
-        )
-        
-        return messages
+
+        return self.message_bus.drain(self.agent_id)
     
     def send_message(self, message: Message):
         """Send message to bus"""
@@ -89,13 +144,20 @@ class AutonomousAgent(ABC):
             message.sender = self.agent_id
             self.message_bus.publish(message)
     
-    def broadcast_result(self, capability: AgentCapability, result: Any, metadata: Dict[str, Any] = None):
-        """Broadcast result to all interested agents"""
+    def broadcast_result(self, capabilities, result: Any, metadata: Dict[str, Any] = None):
+        """Broadcast result to all interested agents
+
+        Accepts one capability or a list; a multi-capability result goes
+        out as a single message instead of one publish per capability
+        """
+        if isinstance(capabilities, AgentCapability):
+            capabilities = [capabilities]
         message = Message(
             type=MessageType.RESULT,
             sender=self.agent_id,
             receiver=None,  # Broadcast
-            capability=capability,
+            capability=capabilities[0] if capabilities else None,
+            capabilities=list(capabilities),
             payload={"result": result},
             metadata=metadata or {}
         )
@@ -137,18 +199,29 @@ class AutonomousAgent(ABC):
         """
         if not self.can_execute(shared_state):
             return None
-        
+
+        cache_key = self._state_key(shared_state)
+        if cache_key is not None:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                # Same relevant inputs as a previous run - rebroadcast
+                # the memoized result instead of re-running process()
+                self.broadcast_result(self.capabilities, cached)
+                return cached
+
         try:
             self.is_active = True
             result = self.process(shared_state)
             self.is_active = False
-            
-            # Broadcast results for each capability
-            for capability in self.capabilities:
-                self.broadcast_result(capability, result)
-            
+
+            if cache_key is not None:
+                self._result_cache[cache_key] = result
+
+            # One broadcast covering every capability this agent serves
+            self.broadcast_result(self.capabilities, result)
+
             return result
-            
+
         except Exception as e:
             self.is_active = False
             error_msg = Message(
@@ -159,6 +232,54 @@ class AutonomousAgent(ABC):
             )
             self.send_message(error_msg)
             raise
-    
+
+    def supports_async(self) -> bool:
+        """Check if agent implements an async aprocess method"""
+        return callable(getattr(self, 'aprocess', None))
+
+    async def aexecute(self, shared_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Async counterpart of execute for agents that implement aprocess
+
+        Args:
+            shared_state: Shared state from orchestrator
+
+        Returns:
+            Results or None if cannot execute
+        """
+        if not self.can_execute(shared_state):
+            return None
+
+        cache_key = self._state_key(shared_state)
+        if cache_key is not None:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self.broadcast_result(self.capabilities, cached)
+                return cached
+
+        try:
+            self.is_active = True
+            result = await self.aprocess(shared_state)
+            self.is_active = False
+
+            if cache_key is not None:
+                self._result_cache[cache_key] = result
+
+            # One broadcast covering every capability this agent serves
+            self.broadcast_result(self.capabilities, result)
+
+            return result
+
+        except Exception as e:
+            self.is_active = False
+            error_msg = Message(
+                type=MessageType.ERROR,
+                sender=self.agent_id,
+                payload={"error": str(e)},
+                metadata={"exception_type": type(e).__name__}
+            )
+            self.send_message(error_msg)
+            raise
+
     def __repr__(self):
         return f"{self.agent_id}(capabilities={[c.value for c in self.capabilities]})"
@@ -2,14 +2,23 @@
 DAG Orchestrator
 Coordinates all agents via Directed Acyclic Graph execution
 """
-from typing import Dict, Any, List
-import json
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
+from utils.json_io import json_dumps
 from models.data_models import ExecutionState, ProductModel
 from agents.data_parser_agent import DataParserAgent
 from agents.question_generator_agent import QuestionGeneratorAgent
 from agents.content_logic_agent import ContentLogicAgent
 from agents.template_engine_agent import TemplateEngineAgent
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Shared background pool for output writes - two threads comfortably
+# cover the three small page files without spawning a pool per save
+_write_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='save_outputs')
 
 
 class DAGOrchestrator:
@@ -51,7 +60,7 @@ class DAGOrchestrator:
             "template_product": ["content_logic_product"],
             "template_comparison": ["content_logic_comparison"]
         }
-    
+
     def execute(self, raw_product_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute complete workflow
@@ -62,107 +71,84 @@ class DAGOrchestrator:
         Returns:
             Dict with all generated pages
         """
-        print("\n" + "="*60)
-        print("🚀 STARTING MULTI-AGENT ORCHESTRATION")
-        print("="*60 + "\n")
+        # One event loop for the whole pipeline - agents fan out inside
+        # it instead of paying loop construction per call
+        return asyncio.run(self.aexecute(raw_product_data))
+    
+    async def aexecute(self, raw_product_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async pipeline: parse, fan out independent stages, fan in"""
+        logger.info("\n" + "="*60)
+        logger.info("🚀 STARTING MULTI-AGENT ORCHESTRATION")
+        logger.info("="*60 + "\n")
         
-        # Initialize context
-        self.state.context['raw_product_data'] = raw_product_data
+        # Initialize context - one timestamp per run, stamped on every page
+        self.state.context.raw_product_data = raw_product_data
+        self.state.context.generated_at = datetime.now().isoformat()
         
         # Step 1: Parse product data
-        print("📊 STEP 1: Parsing Product Data")
-        print("-" * 60)
-        result = self.agents['data_parser'].execute(self.state.context)
+        logger.info("📊 STEP 1: Parsing Product Data")
+        logger.info("-" * 60)
+        result = await self.agents['data_parser'].execute_async(self.state.context)
         if not result.success:
             raise Exception(f"DataParser failed: {result.error}")
         product = result.data
         self.state.update('product', product)
         
-        # Step 2: Generate questions
-        print("\n❓ STEP 2: Generating Questions")
-        print("-" * 60)
-        result = self.agents['question_generator'].execute(self.state.context)
-        if not result.success:
-            raise Exception(f"QuestionGenerator failed: {result.error}")
-        questions = result.data
-        self.state.update('questions', questions)
-        
-        # Step 3: Process content blocks in parallel (simulated)
-        print("\n🔧 STEP 3: Processing Content Blocks")
-        print("-" * 60)
-        
-        # FAQ content
-        print("\n  📝 Processing FAQ content...")
-        faq_context = {
-            'product': product,
-            'block_types': []  # FAQ doesn't need content blocks, uses questions directly
-        }
-        
-        # Product page content
-        print("\n  📄 Processing Product Page content...")
-        product_context = {
-            'product': product,
-            'block_types': ['benefits', 'ingredients', 'usage', 'safety']
-        }
-        result = self.agents['content_logic'].execute(product_context)
-        if not result.success:
-            raise Exception(f"ContentLogic (product) failed: {result.error}")
-        product_content = result.data
-        
-        # Comparison page content
-        print("\n  ⚖️  Processing Comparison content...")
-        comparison_context = {
-            'product': product,
-            'block_types': ['comparison']
-        }
-        result = self.agents['content_logic'].execute(comparison_context)
-        if not result.success:
-            raise Exception(f"ContentLogic (comparison) failed: {result.error}")
-        comparison_content = result.data
-        
-        # Step 4: Fill templates
-        print("\n📋 STEP 4: Filling Templates")
-        print("-" * 60)
-        
-        # FAQ template
-        print("\n  📝 Filling FAQ template...")
-        faq_template_context = {
-            'template_type': 'faq',
-            'product': product,
-            'questions': questions
-        }
-        result = self.agents['template_engine'].execute(faq_template_context)
-        if not result.success:
-            raise Exception(f"TemplateEngine (FAQ) failed: {result.error}")
-        faq_page = result.data
-        
-        # Product template
-        print("\n  📄 Filling Product Page template...")
-        product_template_context = {
-            'template_type': 'product',
-            'product': product,
-            'content_data': product_content
-        }
-        result = self.agents['template_engine'].execute(product_template_context)
-        if not result.success:
-            raise Exception(f"TemplateEngine (Product) failed: {result.error}")
-        product_page = result.data
-        
-        # Comparison template
-        print("\n  ⚖️  Filling Comparison template...")
-        comparison_template_context = {
-            'template_type': 'comparison',
-            'product': product,
-            'content_data': comparison_content
-        }
-        result = self.agents['template_engine'].execute(comparison_template_context)
-        if not result.success:
-            raise Exception(f"TemplateEngine (Comparison) failed: {result.error}")
-        comparison_page = result.data
+        # Steps 2-4: the remaining work is two fused pipelines - each
+        # template starts the moment its own producer finishes, with no
+        # barrier between the branches
+        logger.info("\n❓ STEP 2-4: Generating Questions, Content and Templates")
+        logger.info("-" * 60)
+
+        generated_at = self.state.context.generated_at
+
+        async def fill_template(template_type: str, **content) -> Dict[str, Any]:
+            result = await self.agents['template_engine'].execute_async({
+                'template_type': template_type,
+                'product': product,
+                'generated_at': generated_at,
+                **content
+            })
+            if not result.success:
+                raise Exception(f"TemplateEngine ({template_type}) failed: {result.error}")
+            return result.data
+
+        async def faq_chain() -> Dict[str, Any]:
+            # question_generator → template_faq
+            questions_result = await self.agents['question_generator'].execute_async(
+                self.state.context
+            )
+            if not questions_result.success:
+                raise Exception(f"QuestionGenerator failed: {questions_result.error}")
+            questions = questions_result.data
+            self.state.update('questions', questions)
+            return await fill_template('faq', questions=questions)
+
+        async def content_chains() -> List[Dict[str, Any]]:
+            # content_logic_{product,comparison} → template_{product,comparison}
+            # One fused call replaces the four separate product-page blocks
+            product_result, comparison_result = await self.agents['content_logic'].execute_batch_async([
+                {'product': product, 'block_types': ['combined']},
+                {'product': product, 'block_types': ['comparison']}
+            ])
+            if not product_result.success:
+                raise Exception(f"ContentLogic (product) failed: {product_result.error}")
+            if not comparison_result.success:
+                raise Exception(f"ContentLogic (comparison) failed: {comparison_result.error}")
+            # Split the combined result into the per-section content the
+            # template fill expects
+            return await asyncio.gather(
+                fill_template('product', content_data=product_result.data['combined']),
+                fill_template('comparison', content_data=comparison_result.data)
+            )
+
+        faq_page, (product_page, comparison_page) = await asyncio.gather(
+            faq_chain(), content_chains()
+        )
         
         # Step 5: Collect outputs
-        print("\n✅ STEP 5: Collecting Outputs")
-        print("-" * 60)
+        logger.info("\n✅ STEP 5: Collecting Outputs")
+        logger.info("-" * 60)
         
         outputs = {
             'faq': faq_page,
@@ -170,30 +156,91 @@ class DAGOrchestrator:
             'comparison_page': comparison_page
         }
         
-        print("\n" + "="*60)
-        print("✨ ORCHESTRATION COMPLETE")
-        print("="*60)
-        print(f"\n📊 Generated {len(outputs)} pages:")
-        print(f"  ✓ FAQ Page: {faq_page['total_questions']} questions")
-        print(f"  ✓ Product Page: {product_page['product']['name']}")
-        print(f"  ✓ Comparison Page: {comparison_page['products'][0]['name']} vs {comparison_page['products'][1]['name']}")
-        print()
+        logger.info("\n" + "="*60)
+        logger.info("✨ ORCHESTRATION COMPLETE")
+        logger.info("="*60)
+        logger.info("\n📊 Generated %d pages:", len(outputs))
+        logger.info("  ✓ FAQ Page: %d questions", faq_page['total_questions'])
+        logger.info("  ✓ Product Page: %s", product_page['product']['name'])
+        logger.info("  ✓ Comparison Page: %s vs %s",
+                    comparison_page['products'][0]['name'],
+                    comparison_page['products'][1]['name'])
+        logger.info("")
         
         return outputs
     
-    def save_outputs(self, outputs: Dict[str, Any], output_dir: str = "output"):
-        """Save outputs to JSON files"""
-        import os
+    @staticmethod
+    def run_batch(products: List[Dict[str, Any]], max_workers: int = 10,
+                  on_progress: Optional[Callable[[int, int], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Run the full pipeline over many products concurrently
+        
+        Each product gets its own DAGOrchestrator (and agent instances),
+        so no execution state bleeds between threads; the LLM client and
+        its connection pool are the only shared pieces, and those are
+        thread-safe. Results come back in input order
         
+        Args:
+            products: Raw product dicts, one pipeline run each
+            max_workers: Upper bound on concurrent pipelines (keep below
+                the provider's rate limit)
+            on_progress: Optional callback invoked as (done, total) after
+                each pipeline finishes
+            
+        Returns:
+            List of output dicts in the same order as products
+        """
+        total = len(products)
+        done = 0
+        
+        def run_one(raw_product_data: Dict[str, Any]) -> Dict[str, Any]:
+            nonlocal done
+            outputs = DAGOrchestrator().execute(raw_product_data)
+            done += 1
+            if on_progress:
+                on_progress(done, total)
+            return outputs
+        
+        if not products:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, total)) as executor:
+            return list(executor.map(run_one, products))
+    
+    def save_outputs(self, outputs: Dict[str, Any], output_dir: str = "output") -> List[Future]:
+        """
+        Save outputs to JSON files
+
+        Serialization happens inline (orjson-backed, cheap), but the
+        disk writes run on a small background pool so the caller is not
+        blocked on the filesystem. Returns the write futures; callers
+        that must see the files on disk can .result() them, everyone
+        else can ignore the return value - the pool's non-daemon threads
+        finish outstanding writes before interpreter exit
+
+        Args:
+            outputs: Page dicts keyed by page type
+            output_dir: Directory to write the JSON files into
+
+        Returns:
+            One Future per file, resolving to its path once written
+        """
+        import os
+
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
-        
+
+        def write_file(filepath: str, payload: bytes) -> str:
+            with open(filepath, 'wb') as f:
+                f.write(payload)
+            logger.info("💾 Saved: %s", filepath)
+            return filepath
+
         # Save each page
+        futures = []
         for page_type, data in outputs.items():
             filename = f"{page_type}.json" if page_type != "product_page" else "product_page.json"
             filepath = os.path.join(output_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            print(f"💾 Saved: {filepath}")
+            payload = json_dumps(data, indent=True).encode('utf-8')
+            futures.append(_write_pool.submit(write_file, filepath, payload))
+        return futures
@@ -3,12 +3,27 @@ Dynamic Multi-Agent Orchestrator
 Coordinates autonomous agents through message-based communication
 No hard-coded workflows - agents self-organize based on capabilities
 """
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, Tuple
+import asyncio
 import time
+from collections import ChainMap, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from orchestrator.agent_protocol import (
     MessageBus, AgentRegistry, AgentCapability, Message, MessageType
 )
 from orchestrator.autonomous_agent import AutonomousAgent
+from utils.json_io import json_dump_bytes
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def _graph_default(obj: Any) -> Any:
+    """Serialize objects orjson/stdlib json don't know natively"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class DynamicOrchestrator:
@@ -26,15 +41,26 @@ class DynamicOrchestrator:
         self.message_bus = MessageBus()
         self.registry = AgentRegistry()
         self.agents: Dict[str, AutonomousAgent] = {}
-        self.shared_state: Dict[str, Any] = {}
+        self.shared_state: ChainMap = ChainMap({})
         self.execution_log: List[Dict[str, Any]] = []
-    
+        # Successful agents in completion order, maintained incrementally
+        # so summaries never re-filter the whole log
+        self._success_order: List[str] = []
+        # Kahn's-algorithm bookkeeping, inverted once at registration:
+        # unmet-dependency count per agent and capability -> consumers
+        self._base_in_degree: Dict[str, int] = {}
+        self._consumers: Dict[str, List[str]] = defaultdict(list)
+
     def register_agent(self, agent: AutonomousAgent):
         """Register an autonomous agent"""
         agent.register(self.message_bus)
         self.registry.register(agent.get_registration())
         self.agents[agent.agent_id] = agent
-        print(f"  → {agent.agent_id} registered")
+        dependencies = set(agent.dependencies)
+        self._base_in_degree[agent.agent_id] = len(dependencies)
+        for dep in dependencies:
+            self._consumers[dep.value].append(agent.agent_id)
+        logger.info("  → %s registered", agent.agent_id)
     
     def execute(self, initial_state: Dict[str, Any], max_iterations: int = 20) -> Dict[str, Any]:
         """
@@ -47,147 +73,305 @@ class DynamicOrchestrator:
         Returns:
             Final shared state with all results
         """
-        print("\n" + "="*70)
-        print("🤖 DYNAMIC MULTI-AGENT ORCHESTRATION")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("🤖 DYNAMIC MULTI-AGENT ORCHESTRATION")
+        logger.info("="*70)
         
-        # Initialize shared state
-        self.shared_state = initial_state.copy()
+        # Layered shared state: agent writes land in the fresh top
+        # layer, reads fall through to the caller's dict - no O(N) copy
+        # and the caller's initial_state is never mutated
+        self.shared_state = ChainMap({}, initial_state)
+        # One timestamp per run - every template stamps the same instant
+        self.shared_state.setdefault('run_timestamp', datetime.now(timezone.utc).isoformat())
         
         # Track execution
         executed_agents: Set[str] = set()
         iteration = 0
+
+        # The whole schedule is known up front: level-sets of the
+        # capability DAG, computed once instead of re-polling readiness
+        # every loop turn
+        batches = self._compute_batches()
+        if len(batches) > max_iterations:
+            # Same contract as the old polling loop: stop at the cap and
+            # report whatever didn't run as not-executed
+            logger.info(
+                "⚠️  Dependency graph needs %d batches; capping at max_iterations=%d",
+                len(batches), max_iterations
+            )
+            batches = batches[:max_iterations]
         
-        print(f"\n📊 Registered Agents: {len(self.agents)}")
+        logger.info("\n📊 Registered Agents: %d", len(self.agents))
         for agent_id, agent in self.agents.items():
             caps = [c.value for c in agent.capabilities]
             deps = [d.value for d in agent.dependencies]
-            print(f"  • {agent_id}")
-            print(f"    Capabilities: {caps}")
-            print(f"    Dependencies: {deps}")
+            logger.info("  • %s", agent_id)
+            logger.info("    Capabilities: %s", caps)
+            logger.info("    Dependencies: %s", deps)
         
-        print("\n" + "-"*70)
-        print("🚀 Starting Dynamic Execution")
-        print("-"*70 + "\n")
+        logger.info("\n" + "-"*70)
+        logger.info("🚀 Starting Dynamic Execution")
+        logger.info("-"*70 + "\n")
         
-        while iteration < max_iterations:
+        for ready_agents in batches:
             iteration += 1
             executed_this_round = []
-            
-            # Find agents that can execute
-            ready_agents = self._find_ready_agents(executed_agents)
-            
-            if not ready_agents:
-                # No more agents can execute
-                break
-            
-            print(f"🔄 Iteration {iteration}: {len(ready_agents)} agent(s) ready")
-            
-            # Execute ready agents (simulated parallel execution)
-            for agent_id in ready_agents:
-                agent = self.agents[agent_id]
-                
-                try:
-                    print(f"  ⚡ Executing {agent_id}...")
-                    start_time = time.time()
-                    
-                    result = agent.execute(self.shared_state)
-                    
-                    execution_time = time.time() - start_time
-                    
+
+            logger.info("🔄 Batch %d: %d agent(s) ready", iteration, len(ready_agents))
+
+            # Agents with an async aprocess run concurrently in a single
+            # event loop; the rest execute sequentially as before
+            async_ready = [a for a in ready_agents if self.agents[a].supports_async()]
+            sync_ready = [a for a in ready_agents if not self.agents[a].supports_async()]
+
+            if async_ready:
+                if len(async_ready) > 1:
+                    logger.info("  ⚡ Executing %d agents concurrently: %s", len(async_ready), ', '.join(async_ready))
+
+                for agent_id, result, execution_time in asyncio.run(
+                    self._execute_async_batch(async_ready, iteration)
+                ):
                     if result:
-                        # Update shared state with results
-                        # IMPORTANT: Merge results instead of overwriting
-                        for capability in agent.capabilities:
-                            cap_key = capability.value
-                            
-                            # If capability key doesn't exist, create it
-                            if cap_key not in self.shared_state:
-                                self.shared_state[cap_key] = {}
-                            
-                            # Merge the result into existing capability data
-                            if isinstance(self.shared_state[cap_key], dict) and isinstance(result, dict):
-                                self.shared_state[cap_key].update(result)
-                            else:
-                                # If not dict, just store it
-                                self.shared_state[cap_key] = result
-                        
+                        self._merge_result(agent_id, result)
                         executed_agents.add(agent_id)
                         executed_this_round.append(agent_id)
-                        
-                        # Log execution
-                        self.execution_log.append({
-                            "iteration": iteration,
-                            "agent": agent_id,
-                            "capabilities": [c.value for c in agent.capabilities],
-                            "execution_time": execution_time,
-                            "success": True
-                        })
-                        
-                        print(f"    ✓ {agent_id} completed in {execution_time:.2f}s")
-                    
-                except Exception as e:
-                    print(f"    ✗ {agent_id} failed: {str(e)}")
-                    self.execution_log.append({
-                        "iteration": iteration,
-                        "agent": agent_id,
-                        "error": str(e),
-                        "success": False
-                    })
-                    raise
-            
+                        self._log_success(iteration, agent_id, execution_time)
+                        logger.info("    ✓ %s completed in %.2fs", agent_id, execution_time)
+
+            # Sync agents in the same round are independent and I/O-heavy,
+            # so they fan out on threads; round cost is the slowest agent
+            if len(sync_ready) > 1:
+                logger.info("  ⚡ Executing %d agents on threads: %s", len(sync_ready), ', '.join(sync_ready))
+                with ThreadPoolExecutor(max_workers=len(sync_ready)) as pool:
+                    outcomes = list(pool.map(
+                        lambda a: self._execute_sync_agent(a, iteration),
+                        sync_ready
+                    ))
+            else:
+                outcomes = [self._execute_sync_agent(a, iteration) for a in sync_ready]
+
+            # Merging happens on this thread only after the batch joins,
+            # so in-flight agents never observe a half-merged state
+            for agent_id, result, execution_time in outcomes:
+                if result:
+                    self._merge_result(agent_id, result)
+                    executed_agents.add(agent_id)
+                    executed_this_round.append(agent_id)
+                    self._log_success(iteration, agent_id, execution_time)
+                    logger.info("    ✓ %s completed in %.2fs", agent_id, execution_time)
+
             if not executed_this_round:
                 # No progress made
                 break
-            
-            print()
+
+            logger.info("")
         
         # Check if all agents executed
         not_executed = set(self.agents.keys()) - executed_agents
         
-        print("-"*70)
-        print("📊 Execution Summary")
-        print("-"*70)
-        print(f"  Total Iterations: {iteration}")
-        print(f"  Agents Executed: {len(executed_agents)}/{len(self.agents)}")
-        print(f"  Execution Order: {' → '.join([log['agent'] for log in self.execution_log if log['success']])}")
+        logger.info("-"*70)
+        logger.info("📊 Execution Summary")
+        logger.info("-"*70)
+        logger.info("  Total Batches: %d", iteration)
+        logger.info("  Agents Executed: %d/%d", len(executed_agents), len(self.agents))
+        logger.info("  Execution Order: %s", ' → '.join(self._success_order))
         
         if not_executed:
-            print(f"  ⚠️  Not Executed: {', '.join(not_executed)}")
-            print(f"     (Dependencies not satisfied)")
+            logger.info("  ⚠️  Not Executed: %s", ', '.join(not_executed))
+            logger.info("     (Dependencies not satisfied)")
         
-        print("\n" + "="*70)
-        print("✅ ORCHESTRATION COMPLETE")
-        print("="*70 + "\n")
-        
-        return self.shared_state
+        logger.info("\n" + "="*70)
+        logger.info("✅ ORCHESTRATION COMPLETE")
+        logger.info("="*70 + "\n")
+
+        # Flatten for callers - they get a plain dict, not the ChainMap
+        return dict(self.shared_state)
     
-    def _find_ready_agents(self, executed: Set[str]) -> List[str]:
+    def _execute_sync_agent(self, agent_id: str,
+                            iteration: int) -> Tuple[str, Any, float]:
         """
-        Find agents that are ready to execute
-        
+        Run one sync agent and time it - thread-safe aside from the
+        execution log append on failure (guarded by the GIL)
+
+        Returns:
+            (agent_id, result, execution_time) tuple
+        """
+        agent = self.agents[agent_id]
+        logger.info("  ⚡ Executing %s...", agent_id)
+        start_time = time.time()
+        try:
+            result = agent.execute(self.shared_state)
+        except Exception as e:
+            logger.info("    ✗ %s failed: %s", agent_id, e)
+            self.execution_log.append({
+                "iteration": iteration,
+                "agent": agent_id,
+                "error": str(e),
+                "success": False
+            })
+            raise
+        return agent_id, result, time.time() - start_time
+
+    async def _execute_async_batch(self, agent_ids: List[str],
+                                   iteration: int) -> List[Tuple[str, Any, float]]:
+        """
+        Execute a batch of async-capable agents concurrently
+
         Args:
-            executed: Set of already executed agent IDs
-            
+            agent_ids: Ready agents implementing aprocess
+            iteration: Current iteration number (for failure logging)
+
         Returns:
-            List of agent IDs ready to execute
+            List of (agent_id, result, execution_time) tuples
         """
-        ready = []
-        
-        for agent_id, agent in self.agents.items():
-            # Skip if already executed
-            if agent_id in executed:
-                continue
-            
-            # Check if dependencies are satisfied
-            if agent.can_execute(self.shared_state):
-                ready.append(agent_id)
-        
-        return ready
-    
-    def get_execution_graph(self) -> Dict[str, Any]:
-        """Get execution graph for visualization"""
-        return {
+        async def run_one(agent_id: str) -> Tuple[str, Any, float]:
+            agent = self.agents[agent_id]
+            start_time = time.time()
+            try:
+                result = await agent.aexecute(self.shared_state)
+            except Exception as e:
+                logger.info("    ✗ %s failed: %s", agent_id, e)
+                self.execution_log.append({
+                    "iteration": iteration,
+                    "agent": agent_id,
+                    "error": str(e),
+                    "success": False
+                })
+                raise
+            return agent_id, result, time.time() - start_time
+
+        return await asyncio.gather(*(run_one(a) for a in agent_ids))
+
+    def _merge_result(self, agent_id: str, result: Dict[str, Any]):
+        """
+        Merge an agent result into shared state
+
+        IMPORTANT: Merge results instead of overwriting so agents sharing
+        a capability (e.g. the four content processors) accumulate output
+        """
+        agent = self.agents[agent_id]
+        writable = self.shared_state.maps[0]
+        for cap_key in agent._cap_values:
+            current = self.shared_state.get(cap_key)
+
+            # Merge the result into existing capability data
+            if isinstance(current, dict) and isinstance(result, dict):
+                # Copy-on-write: a dict inherited from the caller's
+                # layer is cloned before merging, never mutated
+                if cap_key not in writable:
+                    current = dict(current)
+                current.update(result)
+                writable[cap_key] = current
+            elif isinstance(result, dict):
+                writable[cap_key] = dict(result)
+            else:
+                # If not dict, just store it
+                writable[cap_key] = result
+
+    def _log_success(self, iteration: int, agent_id: str, execution_time: float):
+        """Record a successful agent execution"""
+        self._success_order.append(agent_id)
+        self.execution_log.append({
+            "iteration": iteration,
+            "agent": agent_id,
+            "capabilities": [c.value for c in self.agents[agent_id].capabilities],
+            "execution_time": execution_time,
+            "success": True
+        })
+
+    def _compute_batches(self) -> List[List[str]]:
+        """
+        Compute the topological level-sets of the registered agents
+
+        Runs Kahn's algorithm over the capability DAG without executing
+        anything: batch N holds every agent whose dependencies are fully
+        covered by batches < N (or by the initial shared state). The
+        batch count equals the longest dependency chain, which is the
+        minimum number of sequential rounds. Recomputed at the start of
+        each run so late-registered agents are picked up
+        """
+        in_degree = dict(self._base_in_degree)
+        satisfied: Set[str] = set()
+        ready_queue: deque = deque(
+            agent_id for agent_id, count in in_degree.items() if count == 0
+        )
+        # Capability keys pre-seeded in the initial state count as met
+        for cap_value in list(self._consumers):
+            if cap_value in self.shared_state:
+                self._satisfy(cap_value, in_degree, satisfied, ready_queue)
+
+        batches: List[List[str]] = []
+        while ready_queue:
+            batch = list(ready_queue)
+            ready_queue.clear()
+            batches.append(batch)
+            for agent_id in batch:
+                for cap_key in self.agents[agent_id]._cap_values:
+                    self._satisfy(cap_key, in_degree, satisfied, ready_queue)
+
+        # Agents on the longest remaining chain start first within their
+        # batch, so the critical path is never stuck behind siblings
+        criticality = self._compute_criticality(batches)
+        for batch in batches:
+            batch.sort(key=criticality.__getitem__, reverse=True)
+        return batches
+
+    def _compute_criticality(self, batches: List[List[str]]) -> Dict[str, int]:
+        """
+        Length of the longest dependency chain below each agent
+
+        Walks the batches bottom-up assigning 1 + the max criticality of
+        an agent's consumers (1 for sinks) - the standard bottom-up
+        critical-path assignment
+        """
+        criticality: Dict[str, int] = {}
+        for batch in reversed(batches):
+            for agent_id in batch:
+                successors: Set[str] = set()
+                for cap_key in self.agents[agent_id]._cap_values:
+                    successors.update(self._consumers.get(cap_key, ()))
+                successors.discard(agent_id)
+                criticality[agent_id] = 1 + max(
+                    (criticality.get(s, 0) for s in successors), default=0
+                )
+        return criticality
+
+    def _satisfy(self, cap_value: str, in_degree: Dict[str, int],
+                 satisfied: Set[str], ready_queue: deque):
+        """
+        Mark a capability as available and enqueue any consumer whose
+        last unmet dependency this was
+
+        A capability with several producers is satisfied by whichever
+        finishes first; later producers are no-ops here
+        """
+        if cap_value in satisfied:
+            return
+        satisfied.add(cap_value)
+        for consumer in self._consumers.get(cap_value, ()):
+            in_degree[consumer] -= 1
+            if in_degree[consumer] == 0:
+                ready_queue.append(consumer)
+
+    def get_execution_graph(self, include_messages: bool = False,
+                            as_json: bool = False) -> Any:
+        """
+        Get execution graph for visualization
+
+        Serializing the full message history is O(messages), which hurts
+        when a UI polls this during a long run - by default only the
+        count and the last few messages are included; pass
+        include_messages=True for the complete history.
+
+        Callers that immediately JSON-encode the graph should pass
+        as_json=True: the Message objects go straight into the encoder
+        (orjson walks slotted dataclasses and enums in C) and the
+        intermediate per-message dicts are never allocated
+
+        Returns:
+            Dict by default, UTF-8 JSON bytes when as_json=True
+        """
+        graph = {
             "agents": {
                 agent_id: {
                     "capabilities": [c.value for c in agent.capabilities],
@@ -196,20 +380,28 @@ class DynamicOrchestrator:
                 for agent_id, agent in self.agents.items()
             },
             "execution_log": self.execution_log,
-            "message_history": [msg.to_dict() for msg in self.message_bus.get_history()]
+            "message_count": self.message_bus.history_size()
         }
+        key = "message_history" if include_messages else "recent_messages"
+        messages = (self.message_bus.history_snapshot() if include_messages
+                    else self.message_bus.recent_history(10))
+        if as_json:
+            graph[key] = messages
+            return json_dump_bytes(graph, default=_graph_default)
+        graph[key] = [msg.to_dict() for msg in messages]
+        return graph
     
     def visualize_execution(self):
         """Print execution visualization"""
-        print("\n" + "="*70)
-        print("📈 EXECUTION VISUALIZATION")
-        print("="*70 + "\n")
+        logger.info("\n" + "="*70)
+        logger.info("📈 EXECUTION VISUALIZATION")
+        logger.info("="*70 + "\n")
         
         for i, log in enumerate(self.execution_log, 1):
             if log['success']:
-                print(f"{i}. {log['agent']} ({log['execution_time']:.2f}s)")
-                print(f"   Capabilities: {', '.join(log['capabilities'])}")
+                logger.info("%d. %s (%.2fs)", i, log['agent'], log['execution_time'])
+                logger.info("   Capabilities: %s", ', '.join(log['capabilities']))
             else:
-                print(f"{i}. {log['agent']} ✗ FAILED")
-                print(f"   Error: {log['error']}")
-            print()
+                logger.info("%d. %s ✗ FAILED", i, log['agent'])
+                logger.info("   Error: %s", log['error'])
+            logger.info("")
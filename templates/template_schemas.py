@@ -5,138 +5,213 @@ Structured schemas for FAQ, Product Page, and Comparison Page
 from typing import Dict, Any, List
 from datetime import datetime
 
+from utils.json_io import json_loads, json_dumps
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# Template skeletons built once at import - the getters hand out
+# deepcopies of these frozen prototypes instead of re-parsing the
+# nested literals on every call
+_FAQ_PROTO: Dict[str, Any] = {
+    "page_type": "faq",
+    "product_name": None,
+    "total_questions": 0,
+    "categories": [],
+    "questions": [],
+    "metadata": {
+        "generated_at": None,
+        "version": "1.0"
+    }
+}
+
+_PRODUCT_PROTO: Dict[str, Any] = {
+    "page_type": "product",
+    "product": {
+        "name": None,
+        "tagline": None,
+        "description": None,
+        "price": {
+            "amount": None,
+            "currency": None,
+            "display": None
+        },
+        "concentration": None,
+        "skin_types": [],
+        "key_features": [],
+        "ingredients": {
+            "key_actives": [],
+            "full_list": [],
+            "synergy": None
+        },
+        "benefits": {
+            "primary": None,
+            "detailed": [],
+            "timeline": None,
+            "concerns_addressed": []
+        },
+        "usage": {
+            "steps": [],
+            "timing": None,
+            "tips": [],
+            "pair_with": [],
+            "avoid_with": []
+        },
+        "safety": {
+            "side_effects": [],
+            "contraindications": [],
+            "patch_test": None,
+            "warning_signs": []
+        }
+    },
+    "metadata": {
+        "generated_at": None,
+        "version": "1.0"
+    }
+}
+
+_COMPARISON_PROTO: Dict[str, Any] = {
+    "page_type": "comparison",
+    "products": [
+        {
+            "name": None,
+            "concentration": None,
+            "price": None,
+            "ingredients": [],
+            "benefits": [],
+            "skin_types": [],
+            "strengths": [],
+            "weaknesses": []
+        },
+        {
+            "name": None,
+            "concentration": None,
+            "price": None,
+            "ingredients": [],
+            "benefits": [],
+            "skin_types": [],
+            "strengths": [],
+            "weaknesses": []
+        }
+    ],
+    "comparison_matrix": {
+        "key_differences": [],
+        "similarities": [],
+        "best_for": {
+            "product_a": [],
+            "product_b": []
+        },
+        "price_value": None
+    },
+    "recommendation": None,
+    "metadata": {
+        "generated_at": None,
+        "version": "1.0"
+    }
+}
+
+_PROTOTYPES: Dict[str, Dict[str, Any]] = {
+    "faq": _FAQ_PROTO,
+    "product": _PRODUCT_PROTO,
+    "comparison": _COMPARISON_PROTO
+}
+
+# JSON-encoded prototypes: a loads() round-trip through orjson clones
+# the nested dicts considerably faster than copy.deepcopy traversal
+_PROTOTYPE_JSON: Dict[str, str] = {
+    name: json_dumps(proto) for name, proto in _PROTOTYPES.items()
+}
+
 
 class TemplateRegistry:
     """
     Registry of all template schemas
     """
-    
+
     @staticmethod
     def get_faq_template() -> Dict[str, Any]:
         """FAQ page template schema"""
-        return {
-            "page_type": "faq",
-            "product_name": None,
-            "total_questions": 0,
-            "categories": [],
-            "questions": [],
-            "metadata": {
-                "generated_at": None,
-                "version": "1.0"
-            }
-        }
-    
+        return json_loads(_PROTOTYPE_JSON["faq"])
+
     @staticmethod
     def get_product_page_template() -> Dict[str, Any]:
         """Product page template schema"""
-        return {
-            "page_type": "product",
-            "product": {
-                "name": None,
-                "tagline": None,
-                "description": None,
-                "price": {
-                    "amount": None,
-                    "currency": None,
-                    "display": None
-                },
-                "concentration": None,
-                "skin_types": [],
-                "key_features": [],
-                "ingredients": {
-                    "key_actives": [],
-                    "full_list": [],
-                    "synergy": None
-                },
-                "benefits": {
-                    "primary": None,
-                    "detailed": [],
-                    "timeline": None,
-                    "concerns_addressed": []
-                },
-                "usage": {
-                    "steps": [],
-                    "timing": None,
-                    "tips": [],
-                    "pair_with": [],
-                    "avoid_with": []
-                },
-                "safety": {
-                    "side_effects": [],
-                    "contraindications": [],
-                    "patch_test": None,
-                    "warning_signs": []
-                }
-            },
-            "metadata": {
-                "generated_at": None,
-                "version": "1.0"
-            }
-        }
-    
+        return json_loads(_PROTOTYPE_JSON["product"])
+
     @staticmethod
     def get_comparison_template() -> Dict[str, Any]:
         """Comparison page template schema"""
-        return {
-            "page_type": "comparison",
-            "products": [
-                {
-                    "name": None,
-                    "concentration": None,
-                    "price": None,
-                    "ingredients": [],
-                    "benefits": [],
-                    "skin_types": [],
-                    "strengths": [],
-                    "weaknesses": []
-                },
-                {
-                    "name": None,
-                    "concentration": None,
-                    "price": None,
-                    "ingredients": [],
-                    "benefits": [],
-                    "skin_types": [],
-                    "strengths": [],
-                    "weaknesses": []
+        return json_loads(_PROTOTYPE_JSON["comparison"])
+
+    @staticmethod
+    def get_template(template_type: str) -> Dict[str, Any]:
+        """Get a fresh, safely mutable copy of a template by type"""
+        if template_type not in _PROTOTYPE_JSON:
+            raise ValueError(f"Unknown template type: {template_type}")
+        return json_loads(_PROTOTYPE_JSON[template_type])
+
+    @staticmethod
+    def get_template_readonly(template_type: str) -> Dict[str, Any]:
+        """Get the shared prototype itself - callers must not mutate it"""
+        if template_type not in _PROTOTYPES:
+            raise ValueError(f"Unknown template type: {template_type}")
+        return _PROTOTYPES[template_type]
+
+
+# JSON Schemas mirroring the imperative checks below - fastjsonschema
+# compiles each into a straight-line validator function at import time
+_VALIDATION_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "faq": {
+        "type": "object",
+        "required": ["page_type", "product_name", "questions"],
+        "properties": {
+            "page_type": {"not": {"type": "null"}},
+            "product_name": {"not": {"type": "null"}},
+            "questions": {"type": "array", "minItems": 1}
+        }
+    },
+    "product": {
+        "type": "object",
+        "required": ["product"],
+        "properties": {
+            "product": {
+                "type": "object",
+                "required": ["name", "price", "ingredients", "benefits", "usage"],
+                "properties": {
+                    field: {"not": {"type": "null"}}
+                    for field in ("name", "price", "ingredients", "benefits", "usage")
                 }
-            ],
-            "comparison_matrix": {
-                "key_differences": [],
-                "similarities": [],
-                "best_for": {
-                    "product_a": [],
-                    "product_b": []
-                },
-                "price_value": None
-            },
-            "recommendation": None,
-            "metadata": {
-                "generated_at": None,
-                "version": "1.0"
             }
         }
-    
-    @staticmethod
-    def get_template(template_type: str) -> Dict[str, Any]:
-        """Get template by type"""
-        templates = {
-            "faq": TemplateRegistry.get_faq_template(),
-            "product": TemplateRegistry.get_product_page_template(),
-            "comparison": TemplateRegistry.get_comparison_template()
+    },
+    "comparison": {
+        "type": "object",
+        "required": ["products", "comparison_matrix"],
+        "properties": {
+            "products": {"type": "array", "minItems": 2, "maxItems": 2}
         }
-        
-        if template_type not in templates:
-            raise ValueError(f"Unknown template type: {template_type}")
-        
-        return templates[template_type]
+    }
+}
+
+if fastjsonschema is not None:
+    _COMPILED_VALIDATORS = {
+        name: fastjsonschema.compile(schema)
+        for name, schema in _VALIDATION_SCHEMAS.items()
+    }
+else:
+    _COMPILED_VALIDATORS = {}
 
 
 class TemplateValidator:
     """
     Validates filled templates against schemas
+
+    Validation dispatches to compiled fastjsonschema functions when the
+    package is installed; the hand-walked checks remain as the fallback
     """
-    
+
     @staticmethod
     def validate_faq(data: Dict[str, Any]) -> bool:
         """Validate FAQ template"""
@@ -183,8 +258,32 @@ class TemplateValidator:
             "product": TemplateValidator.validate_product,
             "comparison": TemplateValidator.validate_comparison
         }
-        
+
         if template_type not in validators:
             raise ValueError(f"Unknown template type: {template_type}")
-        
+
+        compiled = _COMPILED_VALIDATORS.get(template_type)
+        if compiled is not None:
+            try:
+                compiled(data)
+            except fastjsonschema.JsonSchemaException as e:
+                raise ValueError(str(e)) from e
+            return True
+
         return validators[template_type](data)
+
+
+# Schemas are dicts built on demand, but registry/validator instances are
+# stateless - one shared pair serves every agent instead of per-agent copies
+_registry = TemplateRegistry()
+_validator = TemplateValidator()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Return the shared TemplateRegistry instance"""
+    return _registry
+
+
+def get_template_validator() -> TemplateValidator:
+    """Return the shared TemplateValidator instance"""
+    return _validator
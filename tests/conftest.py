@@ -0,0 +1,15 @@
+"""
+Shared pytest fixtures
+"""
+import pytest
+from agents.data_parser_agent import DataParserAgent
+
+
+@pytest.fixture(scope="session")
+def parser_agent():
+    """One DataParserAgent for the whole session
+
+    The agent keeps no state between execute calls beyond its
+    execution_count, so a single instance serves every test module
+    """
+    return DataParserAgent()
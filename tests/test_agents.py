@@ -1,142 +1,131 @@
 """
 Unit Tests for Multi-Agent Content Generation System
 """
-import unittest
+from types import MappingProxyType
+
+import pytest
 from models.data_models import ProductModel, Question
-from agents.data_parser_agent import DataParserAgent
-
-
-class TestProductModel(unittest.TestCase):
-    """Test ProductModel data class"""
-    
-    def test_from_dict(self):
-        """Test creating ProductModel from dictionary"""
-        data = {
-            "product_name": "Test Serum",
-            "concentration": "10% Vitamin C",
-            "skin_type": "Oily, Combination",
-            "key_ingredients": "Vitamin C, Hyaluronic Acid",
-            "benefits": "Brightening, Anti-aging",
-            "how_to_use": "Apply daily",
-            "side_effects": "None",
-            "price": "₹699"
-        }
-        
-        product = ProductModel.from_dict(data)
-        
-        self.assertEqual(product.name, "Test Serum")
-        self.assertEqual(product.price, 699)
-        self.assertEqual(product.currency, "INR")
-        self.assertEqual(len(product.skin_types), 2)
-        self.assertEqual(len(product.ingredients), 2)
-    
-    def test_validation(self):
-        """Test product validation"""
-        product = ProductModel(
-            name="Test",
-            concentration="10%",
-            skin_types=["Oily"],
-            ingredients=["Vitamin C"],
-            benefits=["Brightening"],
-            usage_instructions="Apply daily",
-            side_effects="None",
-            price=699,
-            currency="INR"
-        )
-        
-        self.assertTrue(product.validate())
-    
-    def test_to_dict(self):
-        """Test converting ProductModel to dictionary"""
-        product = ProductModel(
-            name="Test",
-            concentration="10%",
-            skin_types=["Oily"],
-            ingredients=["Vitamin C"],
-            benefits=["Brightening"],
-            usage_instructions="Apply daily",
-            side_effects="None",
-            price=699,
-            currency="INR"
-        )
-        
-        data = product.to_dict()
-        
-        self.assertIsInstance(data, dict)
-        self.assertEqual(data["name"], "Test")
-        self.assertEqual(data["price"], 699)
-
-
-class TestQuestion(unittest.TestCase):
-    """Test Question data class"""
-    
-    def test_question_creation(self):
-        """Test creating Question"""
-        question = Question(
-            id="Q001",
-            category="Safety",
-            question="Is this safe?",
-            priority=1
-        )
-        
-        self.assertEqual(question.id, "Q001")
-        self.assertEqual(question.category, "Safety")
-        self.assertIsNone(question.answer)
-    
-    def test_to_dict(self):
-        """Test converting Question to dictionary"""
-        question = Question(
-            id="Q001",
-            category="Safety",
-            question="Is this safe?",
-            priority=1,
-            answer="Yes, it is safe."
-        )
-        
-        data = question.to_dict()
-        
-        self.assertIsInstance(data, dict)
-        self.assertEqual(data["id"], "Q001")
-        self.assertEqual(data["answer"], "Yes, it is safe.")
-
-
-class TestDataParserAgent(unittest.TestCase):
-    """Test DataParserAgent"""
-    
-    def test_parse_valid_data(self):
-        """Test parsing valid product data"""
-        agent = DataParserAgent()
-        
-        context = {
-            'raw_product_data': {
-                "product_name": "Test Serum",
-                "concentration": "10% Vitamin C",
-                "skin_type": "Oily",
-                "key_ingredients": "Vitamin C",
-                "benefits": "Brightening",
-                "how_to_use": "Apply daily",
-                "side_effects": "None",
-                "price": "₹699"
-            }
-        }
-        
-        result = agent.execute(context)
-        
-        self.assertTrue(result.success)
-        self.assertIsInstance(result.data, ProductModel)
-        self.assertEqual(result.data.name, "Test Serum")
-    
-    def test_parse_missing_data(self):
-        """Test parsing with missing data"""
-        agent = DataParserAgent()
-        
-        context = {}
-        
-        result = agent.execute(context)
-        
-        self.assertFalse(result.success)
-        self.assertIsNotNone(result.error)
-
-
-if __name__ == '__main__':
-    unittest.main()
+
+# Raw product dict as the pipeline receives it - built once at import
+# and frozen so no test can mutate it under the others
+_VALID_RAW = MappingProxyType({
+    "product_name": "Test Serum",
+    "concentration": "10% Vitamin C",
+    "skin_type": "Oily, Combination",
+    "key_ingredients": "Vitamin C, Hyaluronic Acid",
+    "benefits": "Brightening, Anti-aging",
+    "how_to_use": "Apply daily",
+    "side_effects": "None",
+    "price": "₹699"
+})
+_VALID_CONTEXT = {"raw_product_data": _VALID_RAW}
+
+
+@pytest.fixture(scope="module")
+def product():
+    """A directly-constructed ProductModel, built once for the module"""
+    return ProductModel(
+        name="Test",
+        concentration="10%",
+        skin_types=["Oily"],
+        ingredients=["Vitamin C"],
+        benefits=["Brightening"],
+        usage_instructions="Apply daily",
+        side_effects="None",
+        price=699,
+        currency="INR"
+    )
+
+
+@pytest.fixture(scope="module")
+def question_kwargs():
+    """Keyword arguments for a Question"""
+    return {
+        "id": "Q001",
+        "category": "Safety",
+        "question": "Is this safe?",
+        "priority": 1
+    }
+
+
+# --- ProductModel ---
+
+@pytest.mark.parametrize("field,expected", [
+    ("name", "Test Serum"),
+    ("price", 699),
+    ("currency", "INR"),
+])
+def test_from_dict_fields(field, expected):
+    """Parsing the raw dict populates scalar fields"""
+    product = ProductModel.from_dict(_VALID_RAW)
+
+    assert getattr(product, field) == expected
+
+
+def test_from_dict_numeric_price():
+    """Pre-parsed numeric prices bypass the string parse"""
+    raw = {**_VALID_RAW, "price": 699, "currency": "INR"}
+
+    product = ProductModel.from_dict(raw)
+
+    assert product.price == 699
+    assert product.currency == "INR"
+
+
+def test_from_dict_lists():
+    """Parsing the raw dict splits the comma-separated list fields"""
+    product = ProductModel.from_dict(_VALID_RAW)
+
+    assert product.skin_types == ["Oily", "Combination"]
+    assert product.ingredients == ["Vitamin C", "Hyaluronic Acid"]
+
+
+def test_product_roundtrip(product):
+    """A fully populated product validates and to_dict round-trips it"""
+    assert product.validate()
+
+    data = product.to_dict()
+
+    assert isinstance(data, dict)
+    assert data["name"] == "Test"
+    assert data["price"] == 699
+
+
+# --- Question ---
+
+def test_question_creation(question_kwargs):
+    """Question fields land where expected, answer defaults to None"""
+    question = Question(**question_kwargs)
+
+    assert question.id == "Q001"
+    assert question.category == "Safety"
+    assert question.answer is None
+
+
+def test_question_to_dict(question_kwargs):
+    """to_dict includes the answer when set"""
+    question = Question(**question_kwargs, answer="Yes, it is safe.")
+
+    data = question.to_dict()
+
+    assert isinstance(data, dict)
+    assert data["id"] == "Q001"
+    assert data["answer"] == "Yes, it is safe."
+
+
+# --- DataParserAgent ---
+
+@pytest.mark.parametrize("context,expected_success", [
+    (_VALID_CONTEXT, True),
+    ({}, False),
+])
+def test_agent_execute(parser_agent, context, expected_success):
+    """The success/failure matrix for DataParserAgent.execute"""
+    result = parser_agent.execute(context)
+
+    assert result.success is expected_success
+    if expected_success:
+        assert isinstance(result.data, ProductModel)
+        assert result.data.name == "Test Serum"
+    else:
+        assert result.error is not None
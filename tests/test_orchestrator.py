@@ -0,0 +1,69 @@
+"""
+Unit Tests for the Dynamic Orchestrator
+"""
+import pytest
+from orchestrator.autonomous_agent import AutonomousAgent
+from orchestrator.agent_protocol import AgentCapability
+from orchestrator.dynamic_orchestrator import DynamicOrchestrator
+
+
+class _StubParserAgent(AutonomousAgent):
+    """Minimal agent producing the parse_data capability"""
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(
+            agent_id="stub_parser",
+            capabilities=[AgentCapability.PARSE_DATA],
+            dependencies=[]
+        )
+
+    def process(self, shared_state):
+        return {"parsed": shared_state["raw_product_data"]["product_name"]}
+
+
+class _StubConsumerAgent(AutonomousAgent):
+    """Minimal agent consuming parse_data"""
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(
+            agent_id="stub_consumer",
+            capabilities=[AgentCapability.PROCESS_CONTENT],
+            dependencies=[AgentCapability.PARSE_DATA]
+        )
+
+    def process(self, shared_state):
+        return {"content": shared_state["parse_data"]["parsed"].upper()}
+
+
+@pytest.fixture(scope="module")
+def orchestration():
+    """One run over the stub agents, shared by the module
+
+    Execution is deterministic, so both tests can inspect the same run:
+    returns the caller-side initial state and the resulting shared state
+    """
+    initial_state = {'raw_product_data': {'product_name': 'Test Serum'}}
+    orchestrator = DynamicOrchestrator()
+    orchestrator.register_agent(_StubParserAgent())
+    orchestrator.register_agent(_StubConsumerAgent())
+    result = orchestrator.execute(initial_state)
+    return initial_state, result
+
+
+def test_executes_in_dependency_order(orchestration):
+    """Both agents run and their results land in shared state"""
+    _, result = orchestration
+
+    assert result['parse_data']['parsed'] == 'Test Serum'
+    assert result['process_content']['content'] == 'TEST SERUM'
+
+
+def test_initial_state_not_mutated(orchestration):
+    """The caller's dict is untouched after execute"""
+    initial_state, _ = orchestration
+
+    assert initial_state == {'raw_product_data': {'product_name': 'Test Serum'}}
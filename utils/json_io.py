@@ -0,0 +1,38 @@
+"""
+JSON Helpers
+orjson-backed loads/dumps with a stdlib fallback, shared by all agents
+"""
+from typing import Any, Union
+import json as _stdlib_json
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON using orjson when available (2-6x faster than stdlib)"""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return _stdlib_json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to a JSON string using orjson when available"""
+    if _orjson is not None:
+        option = _orjson.OPT_INDENT_2 if indent else 0
+        return _orjson.dumps(obj, option=option).decode('utf-8')
+    return _stdlib_json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
+
+def json_dump_bytes(obj: Any, default=None) -> bytes:
+    """Serialize straight to UTF-8 bytes, skipping the str round-trip
+
+    With orjson, dataclasses and enums are traversed natively in C -
+    default only fires for types neither backend knows. The stdlib
+    fallback leans on default for those same objects
+    """
+    if _orjson is not None:
+        return _orjson.dumps(obj, default=default)
+    return _stdlib_json.dumps(obj, ensure_ascii=False, default=default).encode('utf-8')
@@ -0,0 +1,57 @@
+"""
+LLM Response Cache
+Disk-backed exact-match cache - the fastest request is the one not made
+"""
+import hashlib
+import os
+import time
+from typing import Any, Optional
+
+from utils.json_io import json_loads, json_dumps
+
+CACHE_DIR = os.path.join("cache", "llm")
+DEFAULT_TTL_SECONDS = 7 * 86400
+
+# Kill switch for runs that must always hit the API
+_DISABLED = os.getenv('LLM_CACHE_DISABLED', '').lower() in ('1', 'true', 'yes')
+
+
+def make_key(*parts: Any) -> str:
+    """Stable hash over arbitrary JSON-serializable key parts"""
+    payload = json_dumps(list(parts))
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    return hashlib.blake2b(payload).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def get(key: str, ttl: float = DEFAULT_TTL_SECONDS) -> Optional[Any]:
+    """Return the cached value for key, or None on miss or expiry"""
+    if _DISABLED:
+        return None
+    path = _path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def put(key: str, value: Any) -> None:
+    """Store a JSON-serializable value under key"""
+    if _DISABLED:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    payload = json_dumps(value)
+    if isinstance(payload, bytes):
+        payload = payload.decode('utf-8')
+    # Write-then-rename so concurrent readers never see partial files
+    tmp_path = _path(key) + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(payload)
+    os.replace(tmp_path, _path(key))
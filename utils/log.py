@@ -0,0 +1,43 @@
+"""
+Logging Helpers
+Central logger factory - level-gated lazy logging for agent hot paths
+"""
+import atexit
+import logging
+import os
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+_configured = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a logger configured for console output
+
+    Configuration happens once per process; the level comes from the
+    LOG_LEVEL environment variable (default INFO). Callers should pass
+    format arguments lazily (logger.info("x %s", y)) so messages below
+    the active level cost only the level check.
+
+    Emission goes through a QueueHandler: callers only enqueue the
+    record, and a background listener thread does the stdout formatting
+    and flushing, so parallel agents never serialize on the stream lock
+    """
+    global _configured
+    if not _configured:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter('%(message)s'))
+
+        queue: SimpleQueue = SimpleQueue()
+        listener = QueueListener(queue, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+
+        root = logging.getLogger()
+        root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+        root.addHandler(QueueHandler(queue))
+        _configured = True
+
+    return logging.getLogger(name)
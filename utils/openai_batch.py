@@ -0,0 +1,137 @@
+"""
+OpenAI Batch API Helper
+Runs many chat completions as one offline batch job - suited to
+non-interactive runs where cost matters more than latency
+"""
+import time
+from typing import Any, Dict, List
+from utils.json_io import json_loads, json_dumps
+from config import MODEL_NAME, get_openai_client
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+POLL_INTERVAL_SECONDS = 30
+
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def submit_batch(requests: List[List[Dict[str, str]]],
+                 model: str = MODEL_NAME,
+                 **params: Any):
+    """
+    Upload requests as one JSONL file and create a batch job
+
+    Args:
+        requests: List of chat message lists, one per completion
+        model: Model to use for every completion
+        params: Extra per-completion parameters (temperature, max_tokens, ...)
+
+    Returns:
+        The created batch object (poll it with wait_for_batch)
+    """
+    client = get_openai_client()
+
+    # Build the JSONL payload - custom_id encodes the request index
+    lines = []
+    for i, messages in enumerate(requests):
+        lines.append(json_dumps({
+            "custom_id": f"request-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": model, "messages": messages, **params}
+        }))
+    payload = "\n".join(lines).encode('utf-8')
+
+    batch_file = client.files.create(
+        file=("batch_input.jsonl", payload),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info("    → Submitted batch job %s with %d requests", batch.id, len(requests))
+
+    return batch
+
+
+def wait_for_batch(batch, poll_interval: float = POLL_INTERVAL_SECONDS):
+    """Poll a batch job until it reaches a terminal state"""
+    client = get_openai_client()
+
+    while batch.status not in TERMINAL_STATUSES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+
+    return batch
+
+
+def collect_batch(batch, request_count: int) -> List[str]:
+    """
+    Map a completed batch's responses back to request order
+
+    Args:
+        batch: A batch object in a terminal state
+        request_count: Number of requests originally submitted
+
+    Returns:
+        List of response texts in submission order
+
+    Raises:
+        RuntimeError: If the batch ended in any state but completed, or
+            if any individual request errored or is missing from the
+            output file
+    """
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch job {batch.id} ended with status: {batch.status}")
+
+    client = get_openai_client()
+    output = client.files.content(batch.output_file_id).text
+
+    # A "completed" batch can still carry per-request failures: errored
+    # requests land in the error file or come back with a non-200
+    # response, so their slots would silently stay None
+    answers: List[str] = [None] * request_count
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        record = json_loads(line)
+        response = record.get("response")
+        if record.get("error") or not response or response.get("status_code") != 200:
+            continue
+        index = int(record["custom_id"].rsplit("-", 1)[1])
+        answers[index] = response["body"]["choices"][0]["message"]["content"]
+
+    missing = [f"request-{i}" for i, answer in enumerate(answers) if answer is None]
+    if missing:
+        raise RuntimeError(
+            f"Batch job {batch.id} completed but {len(missing)} request(s) "
+            f"failed or are missing from the output: {', '.join(missing)}"
+        )
+
+    return answers
+
+
+def batch_chat_completions(requests: List[List[Dict[str, str]]],
+                           model: str = MODEL_NAME,
+                           poll_interval: float = POLL_INTERVAL_SECONDS,
+                           **params: Any) -> List[str]:
+    """
+    Execute many chat completions through the Batch API
+
+    Convenience wrapper: submit, wait, and collect in one call
+
+    Args:
+        requests: List of chat message lists, one per completion
+        model: Model to use for every completion
+        poll_interval: Seconds between status polls
+        params: Extra per-completion parameters (temperature, max_tokens, ...)
+
+    Returns:
+        List of response texts in the same order as requests
+    """
+    batch = submit_batch(requests, model=model, **params)
+    batch = wait_for_batch(batch, poll_interval=poll_interval)
+    return collect_batch(batch, len(requests))
@@ -0,0 +1,39 @@
+"""
+Streaming Helpers
+Consume chat completions as a stream instead of waiting for the full body
+"""
+from typing import Any, Callable, List, Optional
+
+from utils.json_io import json_loads
+
+
+async def astream_completion(client, on_delta: Optional[Callable[[str], None]] = None,
+                             **create_kwargs: Any) -> str:
+    """
+    Stream a chat completion and return the full response text
+
+    Deltas are accumulated as they arrive, so Python-side work overlaps
+    with model generation instead of idling until the last token. An
+    optional on_delta callback receives each text fragment (for progress
+    display)
+    """
+    stream = await client.chat.completions.create(stream=True, **create_kwargs)
+
+    parts: List[str] = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            if on_delta:
+                on_delta(delta)
+
+    return "".join(parts)
+
+
+async def astream_json_completion(client, on_delta: Optional[Callable[[str], None]] = None,
+                                  **create_kwargs: Any) -> Any:
+    """Stream a chat completion and parse the accumulated JSON body"""
+    text = await astream_completion(client, on_delta=on_delta, **create_kwargs)
+    return json_loads(text)